@@ -24,7 +24,7 @@ from core.session import session_manager
 from services import whisper_stt, llm, LLMContextExceededError
 from services.tts_hybrid import tts_service as piper_tts
 from tools import perplexity, tool_manager
-from tools.code_executor import execute_code, run_command, get_system_status, manage_file
+from tools.code_executor import code_executor, execute_code, arun_command, get_system_status, manage_file
 
 # Setup logger first
 logger = setup_logger(__name__)
@@ -639,12 +639,12 @@ async def execute_single_command(tool_name: str, parameters: dict) -> dict:
                 parameters.get('url')
             )
         elif tool_name == 'system_control' and SYSTEM_CONTROL_AVAILABLE:
-            tool_result = system_control.execute_control(
+            tool_result = await system_control.aexecute_control(
                 parameters.get('action', ''),
                 **{k: v for k, v in parameters.items() if k != 'action'}
             )
         elif tool_name == 'run_command':
-            tool_result = run_command(parameters.get('command', ''))
+            tool_result = await arun_command(parameters.get('command', ''))
         else:
             tool_result = await tool_manager.execute_tool(tool_name, parameters)
         
@@ -1740,7 +1740,7 @@ Provide a natural response based on this conversation history. Summarize what we
             
             # System controls
             elif tool_name == 'system_control' and SYSTEM_CONTROL_AVAILABLE:
-                tool_result = system_control.execute_control(
+                tool_result = await system_control.aexecute_control(
                     parameters['action'],
                     **{k: v for k, v in parameters.items() if k != 'action'}
                 )
@@ -1835,12 +1835,12 @@ Result: {json.dumps(tool_result, indent=2)}
                     parameters.get('url')
                 )
             elif tool_name == 'system_control' and SYSTEM_CONTROL_AVAILABLE:
-                tool_result = system_control.execute_control(
+                tool_result = await system_control.aexecute_control(
                     parameters.get('action', ''),
                     **{k: v for k, v in parameters.items() if k != 'action'}
                 )
             elif tool_name == 'run_command':
-                tool_result = run_command(parameters.get('command', ''))
+                tool_result = await arun_command(parameters.get('command', ''))
             else:
                 tool_result = await tool_manager.execute_tool(tool_name, parameters)
             
@@ -2417,7 +2417,7 @@ async def execute_system_command(request: CommandRequest):
         raise HTTPException(status_code=403, detail="System commands are disabled")
     
     logger.info(f"Executing command: {request.command[:50]}")
-    result = run_command(request.command)
+    result = await arun_command(request.command)
     return result
 
 @app.get("/api/system/status")
@@ -2717,6 +2717,8 @@ async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("JARVIS shutting down...")
     session_manager.cleanup_expired()
+    await perplexity.aclose()
+    code_executor.close()
 
 if __name__ == "__main__":
     import uvicorn
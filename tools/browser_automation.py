@@ -4,15 +4,250 @@ Enables JARVIS to control browser: search Google, play YouTube videos, navigate
 Uses Firefox with user's native profile for authentic browsing experience
 """
 import asyncio
+import configparser
+import functools
+import json
 import time
 import subprocess
 import os
 import shutil
+import threading
+import webbrowser
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional
+from urllib.parse import quote_plus
 from core.logger import setup_logger
 
+try:
+    from selenium import webdriver
+    from selenium.webdriver.firefox.options import Options as FirefoxOptions
+    from selenium.webdriver.chrome.options import Options as ChromeOptions
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import (
+        WebDriverException,
+        TimeoutException,
+        InvalidSessionIdException,
+        NoSuchWindowException,
+        NoSuchElementException,
+        StaleElementReferenceException,
+        ElementNotInteractableException,
+        ElementClickInterceptedException,
+    )
+    from selenium.webdriver.common.keys import Keys
+except ImportError:
+    # Selenium missing: placeholders keep the except clauses below valid
+    webdriver = FirefoxOptions = ChromeOptions = WebDriverWait = EC = None
+    Keys = None
+    class WebDriverException(Exception):
+        pass
+    TimeoutException = InvalidSessionIdException = NoSuchWindowException = WebDriverException
+    NoSuchElementException = StaleElementReferenceException = WebDriverException
+    ElementNotInteractableException = ElementClickInterceptedException = WebDriverException
+
 logger = setup_logger(__name__)
 
+# Where the live WebDriver session is recorded so a restarted JARVIS can reattach
+_SESSION_STATE_FILE = os.path.expanduser("~/.cache/jarvis/browser_session.json")
+
+# Locator strategies, as the plain strings Selenium's By constants resolve to
+_CSS = 'css selector'
+_TAG = 'tag name'
+
+# Fixed locators used on every command
+_BODY = (_TAG, 'body')
+_VIDEO = (_CSS, 'video')
+_MOVIE_PLAYER = (_CSS, '#movie_player')
+
+# How long a successful liveness probe is trusted before probing again
+_SESSION_ALIVE_TTL = 2.0
+
+# A current_url reading is reused for this long (our own navigations invalidate it)
+_URL_CACHE_TTL = 0.5
+
+# Volume/seek commands arriving this close together are applied as one change
+_NUDGE_DEBOUNCE = 0.15
+
+# Errors that mean the browser session itself is gone and must be recreated
+_FATAL_SESSION_ERRORS = (InvalidSessionIdException, NoSuchWindowException)
+
+# Expected misses when probing/clicking page elements that may not be there
+_ELEMENT_ERRORS = (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    ElementNotInteractableException,
+    ElementClickInterceptedException,
+)
+
+# Skip buttons that are safe to auto-click from inside the page (2024/2025 YouTube)
+_AD_SKIP_CLICK_SELECTORS = (
+    "button.ytp-skip-ad-button",
+    "button.ytp-ad-skip-button",
+    "button.ytp-ad-skip-button-modern",
+    ".ytp-ad-overlay-close-button",
+)
+_AD_SKIP_CLICK_SELECTOR = ", ".join(_AD_SKIP_CLICK_SELECTORS)
+
+# Explicit skip requests also try the looser container/wildcard matches
+_SKIP_BUTTON_SELECTOR = ", ".join(_AD_SKIP_CLICK_SELECTORS + (
+    ".ytp-ad-skip-button-slot button",
+    ".ytp-skip-ad-button",
+    ".ytp-ad-skip-button-container button",
+    "button[class*='skip']",
+))
+
+# First search result, or the consent dialog that hides the results until accepted
+_RESULTS_READY_SELECTOR = "ytd-video-renderer a#video-title, ytd-consent-bump-v2-lightbox"
+
+# One full skip attempt per round-trip. Returns 'none' when no ad is on screen
+# (the player gets .ad-showing during ads), 'button' or 'text' when a skip button
+# was clicked, and 'waiting' for an ad that cannot be skipped yet.
+_SKIP_AD_PASS_JS = """
+if (!document.querySelector('.ad-showing, .ytp-ad-player-overlay')) return 'none';
+for (const b of document.querySelectorAll(arguments[0])) {
+    if (b.offsetParent !== null && !b.disabled) { b.click(); return 'button'; }
+}
+for (const b of document.querySelectorAll('button')) {
+    if (b.offsetParent !== null && b.innerText.toLowerCase().includes('skip')) {
+        b.click();
+        return 'text';
+    }
+}
+return 'waiting';
+"""
+
+# Installs (once per document) a MutationObserver that clicks skip buttons as
+# soon as they appear or become visible. Returns the number of skips so far,
+# or null off YouTube.
+_AD_SKIPPER_JS = """
+if (!location.hostname.endsWith('youtube.com')) return null;
+if (!window.__jarvisAdSkipper) {
+    const sel = arguments[0];
+    window.__adSkips = 0;
+    let queued = false;
+    const skip = () => {
+        queued = false;
+        document.querySelectorAll(sel).forEach((b) => {
+            if (b.offsetParent !== null) { b.click(); window.__adSkips++; }
+        });
+    };
+    // One check per burst of mutations; setTimeout still fires in background tabs
+    const schedule = () => { if (!queued) { queued = true; setTimeout(skip, 100); } };
+    window.__jarvisAdSkipper = new MutationObserver(schedule);
+    // Skip buttons are often existing nodes un-hidden by a class/style change
+    window.__jarvisAdSkipper.observe(document.body, {
+        childList: true, subtree: true, attributes: true, attributeFilter: ['class', 'style']});
+    skip();
+}
+return window.__adSkips;
+"""
+
+# Chrome: arm the skipper in every new document as soon as its DOM exists,
+# so no polling from Python is needed to re-install it after navigation
+_AD_SKIPPER_PRELOAD_JS = (
+    "document.addEventListener('DOMContentLoaded', function () {"
+    + _AD_SKIPPER_JS
+    + "}.bind(null, " + json.dumps(_AD_SKIP_CLICK_SELECTOR) + "));"
+)
+
+# Clicks the first visible, enabled element with the given class; returns bool
+_CLICK_BY_CLASS_JS = """
+const e = document.getElementsByClassName(arguments[0])[0];
+if (e && e.offsetParent !== null && !e.disabled) { e.click(); return true; }
+return false;
+"""
+
+# Read-modify-write of a <video> property in one call:
+# arguments = (prop, delta, min, max|null); returns the new value or null
+_NUDGE_VIDEO_JS = """
+const v = document.querySelector('video');
+if (!v) return null;
+const [prop, delta, lo] = arguments;
+const hi = arguments[3] === null ? Infinity : arguments[3];
+v[prop] = Math.min(hi, Math.max(lo, v[prop] + delta));
+return v[prop];
+"""
+
+# Results page in one call: accepts a cookie prompt (European users) and
+# returns {cookieClicked, video: {href, title} | null} for the first real video
+_RESULTS_PAGE_JS = """
+let cookieClicked = false;
+for (const b of document.querySelectorAll('button')) {
+    if (b.offsetParent !== null && /Accept|Agree|I agree/.test(b.innerText)) {
+        b.click();
+        cookieClicked = true;
+        break;
+    }
+}
+const links = document.querySelectorAll(
+    'ytd-video-renderer #video-title, a#video-title, ytd-video-renderer a#thumbnail');
+for (const a of links) {
+    const href = a.href || '';
+    if (!href.includes('/watch?') || href.includes('/shorts/') || href.includes('googleads')) continue;
+    if (a.offsetParent === null) continue;
+    return {cookieClicked: cookieClicked, video: {href: href, title: a.title || a.textContent.trim()}};
+}
+return {cookieClicked: cookieClicked, video: null};
+"""
+
+# Async script: skips ads in-page, waits for the <video> and starts playback
+_PLAY_WHEN_READY_JS = """
+const done = arguments[arguments.length - 1];
+const timeoutMs = arguments[0];
+const skipSelector = arguments[1];
+const finish = (result) => { clearInterval(iv); clearTimeout(to); done(result); };
+const iv = setInterval(() => {
+    const skip = document.querySelector(skipSelector);
+    if (skip && skip.offsetParent !== null) skip.click();
+    const player = document.querySelector('#movie_player');
+    if (player && player.classList.contains('ad-showing')) return;
+    const v = document.querySelector('video');
+    if (!v || v.readyState < 2) return;
+    if (!v.paused) { finish({ok: true, title: document.title}); return; }
+    clearInterval(iv);
+    v.play().then(() => finish({ok: true, title: document.title}))
+            .catch((e) => finish({ok: false, error: String(e)}));
+}, 150);
+const to = setTimeout(() => finish({ok: false, error: 'timeout'}), timeoutMs);
+"""
+
+
+@functools.lru_cache(maxsize=1)
+def _resolve_firefox_profile() -> Optional[str]:
+    """Find the user's default Firefox profile directory (parsed once per process)"""
+    # Firefox profiles are in ~/.mozilla/firefox/
+    firefox_dir = os.path.expanduser("~/.mozilla/firefox")
+    profiles_ini = os.path.join(firefox_dir, "profiles.ini")
+    if not os.path.exists(profiles_ini):
+        return None
+    
+    default_profile = None
+    parser = configparser.ConfigParser()
+    try:
+        parser.read(profiles_ini)
+    except configparser.Error as e:
+        logger.warning(f"Could not parse {profiles_ini}: {e}")
+    
+    # Find profile with Default=1
+    for section in parser.sections():
+        if parser[section].get("Default") == "1" and "Path" in parser[section]:
+            default_profile = parser[section]["Path"]
+            break
+    
+    # Fallback: find any .default profile
+    if not default_profile:
+        for entry in os.listdir(firefox_dir):
+            if '.default' in entry and os.path.isdir(os.path.join(firefox_dir, entry)):
+                default_profile = entry
+                break
+    
+    if default_profile:
+        # Absolute paths (IsRelative=0) are kept as-is by os.path.join
+        full_profile_path = os.path.join(firefox_dir, default_profile)
+        if os.path.isdir(full_profile_path):
+            return full_profile_path
+    return None
+
 
 class BrowserTool:
     """
@@ -26,23 +261,76 @@ class BrowserTool:
         self._last_video_url = None
         self._browser_type = None
         self._ad_skip_task = None
+        self._ad_skipper_preloaded = False
+        self._loop = None  # App event loop, remembered for calls from worker threads
+        self._body_elem = None
+        self._video_elem = None
+        self._video_url = None  # Page the cached <video> element was found on
+        self._last_alive_ts = 0.0
+        self._url_cache = (0.0, None)  # (monotonic time, url) of the last current_url read
+        self._pending_nudges = {}  # property -> [summed delta, future with the new value]
+        # Serialises driver creation so an eager launch and a first command never race
+        self._driver_lock = threading.Lock()
+        # Every WebDriver call runs here, off the event loop; one worker keeps them ordered
+        # since a session must never see two commands at once
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="webdriver")
         logger.info("BrowserTool initialized")
+        
+        # Opt-in: start the browser now so the first voice command finds it ready
+        if os.getenv("JARVIS_EAGER_BROWSER") == "1":
+            self._executor.submit(self._get_driver)
     
     def _check_session_valid(self) -> bool:
         """Check if current browser session is still valid"""
         if self.driver is None:
             return False
+        # Recently proven alive - skip the round-trip
+        if time.monotonic() - self._last_alive_ts < _SESSION_ALIVE_TTL:
+            return True
         try:
-            _ = self.driver.current_url
+            self._current_url(fresh=True)
             return True
         except Exception as e:
             logger.warning(f"Browser session invalid: {e}")
+            self._last_alive_ts = 0.0
             self.driver = None
             self._browser_type = None
             return False
     
+    def _current_url(self, fresh: bool = False) -> str:
+        """driver.current_url, reusing a reading taken within the last half second"""
+        ts, url = self._url_cache
+        if not fresh and url is not None and time.monotonic() - ts < _URL_CACHE_TTL:
+            return url
+        url = self.driver.current_url
+        # Any successful read also proves the session is alive
+        self._last_alive_ts = time.monotonic()
+        self._url_cache = (self._last_alive_ts, url)
+        return url
+    
     def _get_driver(self, force_new: bool = False):
         """Get or create Selenium WebDriver using Firefox with native profile"""
+        # Waits here if an eager background launch is still starting the browser
+        with self._driver_lock:
+            return self._create_or_reuse_driver(force_new)
+    
+    async def _run(self, fn, *args):
+        """Run a blocking WebDriver call on the driver thread without stalling the event loop"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, functools.partial(fn, *args))
+    
+    def _call(self, fn, *args):
+        """_run for synchronous callers: wait for the driver thread to run fn"""
+        return self._executor.submit(fn, *args).result()
+    
+    async def _navigate(self, url: str):
+        """Load a page off the event loop; with the eager strategy this returns at DOMContentLoaded"""
+        await self._run(self.driver.get, url)
+        self._body_elem = None  # Belonged to the previous document
+        self._url_cache = (0.0, None)
+    
+    def _create_or_reuse_driver(self, force_new: bool):
+        """Return the live driver, reattach to a saved one, or launch a new browser"""
         if not force_new and self._check_session_valid():
             logger.debug("Reusing existing browser session")
             return self.driver
@@ -50,649 +338,806 @@ class BrowserTool:
         if self.driver is not None:
             try:
                 self.driver.quit()
-            except:
-                pass
+            except Exception:
+                pass  # Already dead - that is why we are replacing it
             self.driver = None
             self._browser_type = None
         
+        # Element references and page scripts belong to the old session
+        self._body_elem = None
+        self._video_elem = None
+        self._ad_skipper_preloaded = False
+        
+        # Warm path: reuse a browser left running by a previous JARVIS process
+        if not force_new and self._attach_saved_session():
+            return self.driver
+        
+        if webdriver is None:
+            logger.error("Selenium not installed")
+            return None
+        
+        # Try Firefox FIRST (better for avoiding bot detection with native profile)
         try:
-            from selenium import webdriver
-            from selenium.webdriver.firefox.options import Options as FirefoxOptions
-            from selenium.webdriver.firefox.service import Service as FirefoxService
-            from selenium.webdriver.chrome.options import Options as ChromeOptions
+            firefox_options = FirefoxOptions()
             
-            # Try Firefox FIRST (better for avoiding bot detection with native profile)
-            try:
-                firefox_options = FirefoxOptions()
-                
-                # Use existing Firefox profile to avoid bot detection
-                # Firefox profiles are in ~/.mozilla/firefox/
-                firefox_profile_path = os.path.expanduser("~/.mozilla/firefox")
-                if os.path.exists(firefox_profile_path):
-                    # Find the default profile
-                    profiles_ini = os.path.join(firefox_profile_path, "profiles.ini")
-                    default_profile = None
-                    if os.path.exists(profiles_ini):
-                        with open(profiles_ini, 'r') as f:
-                            content = f.read()
-                            # Look for Default=1 profile or any .default profile
-                            import re
-                            # Find profile with Default=1
-                            for section in content.split('['):
-                                if 'Default=1' in section:
-                                    path_match = re.search(r'Path=(.+)', section)
-                                    if path_match:
-                                        default_profile = path_match.group(1).strip()
-                                        break
-                            # Fallback: find any .default profile
-                            if not default_profile:
-                                for entry in os.listdir(firefox_profile_path):
-                                    if '.default' in entry and os.path.isdir(os.path.join(firefox_profile_path, entry)):
-                                        default_profile = entry
-                                        break
-                    
-                    if default_profile:
-                        full_profile_path = os.path.join(firefox_profile_path, default_profile)
-                        if os.path.isdir(full_profile_path):
-                            # Use the profile directory
-                            firefox_options.add_argument("-profile")
-                            firefox_options.add_argument(full_profile_path)
-                            logger.info(f"Using Firefox profile: {default_profile}")
-                
-                # Disable automation indicators
-                firefox_options.set_preference("dom.webdriver.enabled", False)
-                firefox_options.set_preference("useAutomationExtension", False)
-                firefox_options.set_preference("marionette.enabled", False)
-                
-                # Disable notifications
-                firefox_options.set_preference("dom.webnotifications.enabled", False)
-                
-                self.driver = webdriver.Firefox(options=firefox_options)
-                self._browser_type = 'firefox'
-                logger.info("Firefox WebDriver created with native profile")
-                return self.driver
-                
-            except Exception as e:
-                logger.warning(f"Could not create Firefox driver: {e}")
+            # Use existing Firefox profile to avoid bot detection
+            profile_path = _resolve_firefox_profile()
+            if profile_path:
+                firefox_options.add_argument("-profile")
+                firefox_options.add_argument(profile_path)
+                logger.info(f"Using Firefox profile: {os.path.basename(profile_path)}")
+            
+            # Disable automation indicators
+            firefox_options.set_preference("dom.webdriver.enabled", False)
+            firefox_options.set_preference("useAutomationExtension", False)
+            firefox_options.set_preference("marionette.enabled", False)
+            
+            # Disable notifications
+            firefox_options.set_preference("dom.webnotifications.enabled", False)
+            
+            # driver.get returns at DOMContentLoaded instead of waiting for every asset
+            firefox_options.page_load_strategy = 'eager'
             
-            # Fallback to Chrome (without user-data-dir to avoid lock issues)
+            self.driver = webdriver.Firefox(options=firefox_options)
+            self._browser_type = 'firefox'
+            logger.info("Firefox WebDriver created with native profile")
+            self._save_session()
+            return self.driver
+            
+        except Exception as e:
+            logger.warning(f"Could not create Firefox driver: {e}")
+        
+        # Fallback to Chrome (without user-data-dir to avoid lock issues)
+        try:
+            chrome_options = ChromeOptions()
+            
+            # Essential options
+            chrome_options.add_argument("--start-maximized")
+            chrome_options.add_argument("--disable-infobars")
+            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+            
+            # Hide automation
+            chrome_options.add_experimental_option('excludeSwitches', ['enable-automation'])
+            chrome_options.add_experimental_option('useAutomationExtension', False)
+            chrome_options.page_load_strategy = 'eager'
+            
+            self.driver = webdriver.Chrome(options=chrome_options)
+            self._browser_type = 'chrome'
+            
+            # Hide webdriver flag
             try:
-                chrome_options = ChromeOptions()
-                
-                # Essential options
-                chrome_options.add_argument("--start-maximized")
-                chrome_options.add_argument("--disable-infobars")
-                chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-                
-                # Hide automation
-                chrome_options.add_experimental_option('excludeSwitches', ['enable-automation'])
-                chrome_options.add_experimental_option('useAutomationExtension', False)
-                
-                self.driver = webdriver.Chrome(options=chrome_options)
-                self._browser_type = 'chrome'
-                
-                # Hide webdriver flag
-                try:
-                    self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
-                        'source': 'Object.defineProperty(navigator, "webdriver", {get: () => undefined})'
-                    })
-                except:
-                    pass
-                
-                logger.info("Chrome WebDriver created")
-                return self.driver
-                
-            except Exception as e:
-                logger.warning(f"Could not create Chrome driver: {e}")
+                self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+                    'source': 'Object.defineProperty(navigator, "webdriver", {get: () => undefined})'
+                })
+            except WebDriverException:
+                pass
+            self._preload_ad_skipper()
             
-            logger.error("Could not create any WebDriver")
-            return None
-                
-        except ImportError as e:
-            logger.error(f"Selenium not installed: {e}")
-            return None
+            logger.info("Chrome WebDriver created")
+            self._save_session()
+            return self.driver
+            
+        except Exception as e:
+            logger.warning(f"Could not create Chrome driver: {e}")
+        
+        logger.error("Could not create any WebDriver")
+        return None
+    
+    def _save_session(self):
+        """Record executor URL and session id for reattaching after a restart"""
+        executor = self.driver.command_executor
+        executor_url = getattr(executor, "_url", None) or getattr(
+            getattr(executor, "_client_config", None), "remote_server_addr", None)
+        try:
+            os.makedirs(os.path.dirname(_SESSION_STATE_FILE), exist_ok=True)
+            with open(_SESSION_STATE_FILE, "w") as f:
+                json.dump({
+                    "executor_url": executor_url,
+                    "session_id": self.driver.session_id,
+                    "browser": self._browser_type,
+                }, f)
+        except OSError as e:
+            logger.debug(f"Could not save browser session: {e}")
+    
+    def _clear_saved_session(self):
+        """Forget the recorded session (browser was closed on purpose)"""
+        try:
+            os.remove(_SESSION_STATE_FILE)
+        except OSError:
+            pass
+    
+    def _attach_saved_session(self) -> bool:
+        """Reattach to a recorded WebDriver session if it is still alive"""
+        try:
+            with open(_SESSION_STATE_FILE) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+        
+        if webdriver is None:
+            return False
+        
+        try:
+            class _AttachedRemote(webdriver.Remote):
+                """Remote driver that adopts an existing session instead of creating one"""
+                def start_session(self, capabilities, *args, **kwargs):
+                    self.session_id = state["session_id"]
+                    self.caps = {}
+            
+            options = ChromeOptions() if state.get("browser") == 'chrome' else FirefoxOptions()
+            driver = _AttachedRemote(
+                command_executor=state["executor_url"], options=options)
+            driver.window_handles  # Ping - raises if the session is gone
+        except Exception as e:
+            logger.debug(f"Saved browser session not reusable: {e}")
+            self._clear_saved_session()
+            return False
+        
+        self.driver = driver
+        self._browser_type = state.get("browser")
+        logger.info("Reattached to existing browser session")
+        return True
+    
+    def _send_keys(self, keys):
+        """Send a keyboard shortcut to the page, reusing the cached <body> element"""
+        if self._body_elem is not None:
+            try:
+                self._body_elem.send_keys(keys)
+                return
+            except StaleElementReferenceException:
+                pass  # Page was reloaded - look it up again
+        self._body_elem = self.driver.find_element(*_BODY)
+        self._body_elem.send_keys(keys)
+    
+    def _find_video(self, driver, url: str):
+        """Return the page's <video>, reusing the cached element while the URL is unchanged"""
+        if self._video_elem is not None and self._video_url == url:
+            return self._video_elem
+        videos = driver.find_elements(*_VIDEO)
+        self._video_elem = videos[0] if videos else None
+        self._video_url = url
+        return self._video_elem
+    
+    async def _nudge(self, driver, prop: str, delta: float, lo: float, hi: Optional[float]):
+        """Nudge a <video> property; repeats within the debounce window share one script call"""
+        batch = self._pending_nudges.get(prop)
+        if batch is not None:
+            # A change to this property is already waiting - fold ours into it
+            batch[0] += delta
+            return await asyncio.shield(batch[1])
+        
+        result = asyncio.get_running_loop().create_future()
+        result.add_done_callback(lambda f: f.cancelled() or f.exception())  # Never "unretrieved"
+        batch = self._pending_nudges[prop] = [delta, result]
+        try:
+            await asyncio.sleep(_NUDGE_DEBOUNCE)
+            del self._pending_nudges[prop]
+            value = await self._run(driver.execute_script, _NUDGE_VIDEO_JS, prop, batch[0], lo, hi)
+        except BaseException as e:
+            self._pending_nudges.pop(prop, None)
+            if isinstance(e, Exception):
+                result.set_exception(e)
+            else:
+                result.cancel()
+            raise
+        result.set_result(value)
+        return value
+    
+    def _focus_player(self):
+        """Click the video player so keyboard shortcuts reach it"""
+        self.driver.find_element(*_MOVIE_PLAYER).click()
+    
+    def _click_by_class(self, class_name: str) -> bool:
+        """Click a player button by class in one round-trip (find + click in-page)"""
+        return bool(self.driver.execute_script(_CLICK_BY_CLASS_JS, class_name))
     
     async def _skip_youtube_ads(self, timeout: int = 30) -> bool:
         """Skip YouTube ads by clicking skip button"""
         if not self.driver:
             return False
-            
-        from selenium.webdriver.common.by import By
         
         start_time = time.time()
         
         while time.time() - start_time < timeout:
             try:
-                # Skip button selectors - updated for 2024/2025 YouTube
-                skip_selectors = [
-                    "button.ytp-skip-ad-button",
-                    "button.ytp-ad-skip-button",
-                    "button.ytp-ad-skip-button-modern",
-                    ".ytp-ad-skip-button-slot button",
-                    ".ytp-skip-ad-button",
-                    ".ytp-ad-skip-button-container button",
-                    "button[class*='skip']",
-                    ".ytp-ad-overlay-close-button",
-                ]
-                
-                for selector in skip_selectors:
-                    try:
-                        skip_btn = self.driver.find_element(By.CSS_SELECTOR, selector)
-                        if skip_btn.is_displayed() and skip_btn.is_enabled():
-                            await asyncio.sleep(0.3)
-                            skip_btn.click()
-                            logger.info("Clicked skip ad button")
-                            await asyncio.sleep(0.5)
-                            return True
-                    except:
-                        continue
-                
-                # Try XPath for "Skip" text - multiple languages
-                try:
-                    skip_btns = self.driver.find_elements(By.XPATH, 
-                        "//button[contains(., 'Skip') or contains(., 'skip') or contains(., 'SKIP')]")
-                    for btn in skip_btns:
-                        if btn.is_displayed():
-                            btn.click()
-                            logger.info("Clicked skip ad via text")
-                            await asyncio.sleep(0.5)
-                            return True
-                except:
-                    pass
-                
-                # Check for video ad indicator and wait
-                try:
-                    ad_indicator = self.driver.find_element(By.CSS_SELECTOR, ".ytp-ad-player-overlay")
-                    if ad_indicator:
-                        await asyncio.sleep(0.5)
-                        continue
-                except:
-                    # No ad playing
+                outcome = await self._run(self.driver.execute_script, _SKIP_AD_PASS_JS, _SKIP_BUTTON_SELECTOR)
+                if outcome == 'none':
+                    # No ad playing (the common case)
                     return False
+                if outcome in ('button', 'text'):
+                    logger.info(f"Clicked skip ad ({outcome})")
+                    await asyncio.sleep(0.5)
+                    return True
                 
+                # Unskippable ad - wait for it to finish or become skippable
                 await asyncio.sleep(0.5)
-            except Exception as e:
+            except WebDriverException:
                 await asyncio.sleep(0.5)
         
         return False
     
+    def _preload_ad_skipper(self):
+        """Register the ad skipper to run in every new document (Chrome CDP only)"""
+        try:
+            self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+                'source': _AD_SKIPPER_PRELOAD_JS
+            })
+            self._ad_skipper_preloaded = True
+        except Exception as e:
+            logger.debug(f"Could not preload ad skipper: {e}")
+    
+    def _install_ad_skipper(self) -> Optional[int]:
+        """Install the in-page ad skipper if missing; returns skips so far"""
+        return self.driver.execute_script(_AD_SKIPPER_JS, _AD_SKIP_CLICK_SELECTOR)
+    
     async def _continuous_ad_monitor(self):
-        """Background task to continuously skip ads"""
+        """Background task keeping the in-page ad skipper alive across page loads"""
         logger.info("Starting continuous ad monitor")
-        while self._check_session_valid():
+        last_skips = 0
+        while True:
             try:
-                if self.driver and 'youtube.com' in self.driver.current_url:
-                    skipped = await self._skip_youtube_ads(timeout=2)
-                    if skipped:
-                        logger.info("Ad skipped by continuous monitor")
-                await asyncio.sleep(2)
+                # The observer does the clicking; we only re-arm it and read the count
+                alive, skips = await self._run(self._monitor_tick)
+                if not alive:
+                    break
+                if skips and skips > last_skips:
+                    logger.info("Ad skipped by continuous monitor")
+                last_skips = skips or 0
             except Exception as e:
                 logger.debug(f"Ad monitor error: {e}")
-                await asyncio.sleep(5)
+            await asyncio.sleep(5)
         logger.info("Continuous ad monitor stopped")
     
+    def _monitor_tick(self):
+        """Probe the session and re-arm the skipper; returns (alive, skips so far)"""
+        # One driver-thread hop, so a user command (e.g. close) cannot land in between
+        if not self._check_session_valid():
+            return False, None
+        return True, self._install_ad_skipper()
+    
+    async def _wait_for_playback(self, timeout: int = 15) -> bool:
+        """Skip ads, wait until the video is ready and make sure it plays"""
+        try:
+            # Blocks until the in-page routine resolves - keep it off the event loop
+            result = await self._run(self._play_when_ready, timeout)
+        except Exception as e:
+            logger.debug(f"Playback wait failed: {e}")
+            return False
+        
+        if not result or not result.get("ok"):
+            logger.debug(f"Video did not start: {(result or {}).get('error')}")
+            return False
+        return True
+    
+    def _play_when_ready(self, timeout: int):
+        self.driver.set_script_timeout(timeout + 1)
+        return self.driver.execute_async_script(
+            _PLAY_WHEN_READY_JS, timeout * 1000, _AD_SKIP_CLICK_SELECTOR)
+    
     def _start_ad_monitor(self):
         """Start background ad monitoring"""
+        if self._ad_skipper_preloaded:
+            # Every document arms its own skipper - nothing to poll for
+            return
         if self._ad_skip_task is None or self._ad_skip_task.done():
             try:
-                loop = asyncio.get_running_loop()
-                self._ad_skip_task = loop.create_task(self._continuous_ad_monitor())
+                self._loop = asyncio.get_running_loop()
+                self._ad_skip_task = self._loop.create_task(self._continuous_ad_monitor())
                 logger.info("Ad monitor task started")
             except RuntimeError:
-                # No running event loop, try get_event_loop
-                try:
-                    loop = asyncio.get_event_loop()
-                    self._ad_skip_task = loop.create_task(self._continuous_ad_monitor())
-                    logger.info("Ad monitor task started (fallback)")
-                except Exception as e:
-                    logger.warning(f"Could not start ad monitor: {e}")
+                # Called from a thread: hand the task to the app loop if we know it
+                if self._loop is not None and self._loop.is_running():
+                    self._ad_skip_task = asyncio.run_coroutine_threadsafe(
+                        self._continuous_ad_monitor(), self._loop
+                    )
+                    logger.info("Ad monitor task started (threadsafe)")
+                else:
+                    self._ad_skip_task = None
+                    logger.warning("Could not start ad monitor: no running event loop")
     
     async def youtube_autoplay(self, search_query: str) -> Dict[str, Any]:
         """Search YouTube and autoplay first video with ad skipping"""
+        url = f"https://www.youtube.com/results?search_query={quote_plus(search_query)}"
         try:
-            from selenium.webdriver.common.by import By
-            from selenium.webdriver.support.ui import WebDriverWait
-            from selenium.webdriver.support import expected_conditions as EC
-            
-            driver = self._get_driver()
+            driver = await self._run(self._get_driver)
             if not driver:
-                import webbrowser
-                url = f"https://www.youtube.com/results?search_query={search_query.replace(' ', '+')}"
                 webbrowser.open(url)
                 return {"success": True, "message": "Opened", "method": "native"}
             
             # Navigate to YouTube search
-            url = f"https://www.youtube.com/results?search_query={search_query.replace(' ', '+')}"
             logger.info(f"Navigating to: {url}")
-            driver.get(url)
-            
-            # Wait for page to load
-            await asyncio.sleep(3)
+            await self._navigate(url)
             
-            # Accept cookies if prompted (European users)
+            # Wait until the first result (or the consent dialog) has rendered
             try:
-                cookie_buttons = driver.find_elements(By.XPATH, 
-                    "//button[contains(., 'Accept') or contains(., 'Agree') or contains(., 'I agree')]")
-                for btn in cookie_buttons:
-                    if btn.is_displayed():
-                        btn.click()
-                        await asyncio.sleep(1)
-                        break
-            except:
-                pass
+                await self._run(
+                    WebDriverWait(driver, 5).until,
+                    EC.presence_of_element_located((_CSS, _RESULTS_READY_SELECTOR)),
+                )
+            except TimeoutException:
+                logger.debug("Search results slow to render, reading the page anyway")
             
-            # Find and click first video (skip ads/shorts)
-            video_title = "Video"
-            for selector in [
-                "ytd-video-renderer #video-title",
-                "a#video-title", 
-                "ytd-video-renderer a#thumbnail"
-            ]:
+            # Accept cookies and find first real video (skip ads/shorts) in one round-trip
+            page = await self._run(driver.execute_script, _RESULTS_PAGE_JS) or {}
+            if page.get("cookieClicked") and not page.get("video"):
+                # Results render once the consent dialog is gone
                 try:
-                    videos = driver.find_elements(By.CSS_SELECTOR, selector)
-                    for video_link in videos:
-                        href = video_link.get_attribute("href") or ""
-                        # Skip shorts and ads
-                        if "/shorts/" in href or "googleads" in href:
-                            continue
-                        if video_link.is_displayed():
-                            video_title = video_link.get_attribute("title") or video_link.text or "Video"
-                            logger.info(f"Found video: {video_title}")
-                            video_link.click()
-                            break
-                    else:
-                        continue
-                    break
-                except:
-                    continue
+                    await self._run(
+                        WebDriverWait(driver, 3, poll_frequency=0.1).until,
+                        EC.presence_of_element_located((_CSS, "ytd-video-renderer a#video-title")),
+                    )
+                except TimeoutException:
+                    pass
+                page = await self._run(driver.execute_script, _RESULTS_PAGE_JS) or {}
+            first_video = page.get("video")
+            if not first_video:
+                # Nothing to play - leave the results page up rather than wait on it
+                logger.warning(f"No playable video found for: {search_query}")
+                return {"success": False, "error": "No video found", "message": "Showing search results"}
             
-            # Wait for video page to load
-            await asyncio.sleep(3)
+            video_title = first_video.get("title") or "Video"
+            logger.info(f"Found video: {video_title}")
+            # Navigate straight to the watch URL - avoids stale element clicks
+            await self._navigate(first_video["href"])
+            await self._run(self._install_ad_skipper)
             
-            # Skip ads
-            await self._skip_youtube_ads(timeout=15)
+            # Skip pre-roll ads and start the video in one in-page routine
+            playing = await self._wait_for_playback(timeout=15)
             
             # Start background ad monitor
             self._start_ad_monitor()
             
-            self._last_video_url = driver.current_url
+            self._last_video_url = await self._run(self._current_url)
             
             return {
                 "success": True,
-                "message": "Playing",
+                # The video is open either way; say so when it did not start by itself
+                "message": "Playing" if playing else "Opened video, but it has not started playing",
+                "playing": playing,
                 "video_title": video_title[:50] if len(video_title) > 50 else video_title,
-                "video_url": driver.current_url,
+                "video_url": self._last_video_url,
             }
             
+        except _FATAL_SESSION_ERRORS as e:
+            logger.error(f"YouTube autoplay lost browser session: {e}")
+            self.driver = None
+            self._browser_type = None
+            try:
+                webbrowser.open(url)
+                return {"success": True, "message": "Opened", "method": "fallback"}
+            except Exception:
+                return {"success": False, "error": str(e)}
         except Exception as e:
+            # Recoverable (stale element, page race...) - keep the session alive,
+            # but still get the video in front of the user
             logger.error(f"YouTube autoplay error: {e}")
             try:
-                import webbrowser
-                url = f"https://www.youtube.com/results?search_query={search_query.replace(' ', '+')}"
                 webbrowser.open(url)
                 return {"success": True, "message": "Opened", "method": "fallback"}
-            except:
+            except Exception:
                 return {"success": False, "error": str(e)}
     
     async def youtube_control(self, action: str) -> Dict[str, Any]:
         """Control YouTube playback"""
-        if not self._check_session_valid():
+        if not await self._run(self._check_session_valid):
             return {"success": False, "error": "No browser open"}
         
+        handler = self._YT_ACTIONS.get(action.lower().strip())
+        if handler is None:
+            return {"success": False, "error": f"Unknown: {action}"}
+        
         try:
-            from selenium.webdriver.common.by import By
-            from selenium.webdriver.common.keys import Keys
-            from selenium.webdriver.common.action_chains import ActionChains
-            
             driver = self.driver
-            action = action.lower().strip()
             
             # Check if on YouTube
-            current_url = driver.current_url
+            current_url = await self._run(self._current_url)
             if 'youtube.com' not in current_url:
                 return {"success": False, "error": "Not on YouTube"}
             
-            # Try to find video element
+            # Try to find video element (handlers that locate it in-page skip this)
             video = None
-            try:
-                video = driver.find_element(By.CSS_SELECTOR, "video")
-            except:
-                pass
-            
-            if action in ['pause', 'stop']:
-                if video:
-                    driver.execute_script("arguments[0].pause();", video)
-                else:
-                    # Use keyboard shortcut
-                    driver.find_element(By.TAG_NAME, "body").send_keys("k")
-                return {"success": True, "message": "Paused"}
-            
-            elif action in ['play', 'resume']:
-                if video:
-                    driver.execute_script("arguments[0].play();", video)
-                else:
-                    driver.find_element(By.TAG_NAME, "body").send_keys("k")
-                return {"success": True, "message": "Playing"}
-            
-            elif action == 'toggle':
-                if video:
-                    is_paused = driver.execute_script("return arguments[0].paused;", video)
-                    if is_paused:
-                        driver.execute_script("arguments[0].play();", video)
-                        return {"success": True, "message": "Playing"}
-                    else:
-                        driver.execute_script("arguments[0].pause();", video)
-                        return {"success": True, "message": "Paused"}
-                else:
-                    driver.find_element(By.TAG_NAME, "body").send_keys("k")
-                    return {"success": True, "message": "Toggled"}
-            
-            elif action == 'mute':
-                if video:
-                    driver.execute_script("arguments[0].muted = true;", video)
-                else:
-                    driver.find_element(By.TAG_NAME, "body").send_keys("m")
-                return {"success": True, "message": "Muted"}
-            
-            elif action == 'unmute':
-                if video:
-                    driver.execute_script("arguments[0].muted = false;", video)
-                else:
-                    driver.find_element(By.TAG_NAME, "body").send_keys("m")
-                return {"success": True, "message": "Unmuted"}
-            
-            elif action == 'volume_up':
-                if video:
-                    current = driver.execute_script("return arguments[0].volume;", video)
-                    new_vol = min(1.0, current + 0.1)
-                    driver.execute_script(f"arguments[0].volume = {new_vol};", video)
-                    return {"success": True, "message": f"Volume {int(new_vol * 100)}%"}
-                else:
-                    driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ARROW_UP)
-                    return {"success": True, "message": "Volume up"}
-            
-            elif action == 'volume_down':
-                if video:
-                    current = driver.execute_script("return arguments[0].volume;", video)
-                    new_vol = max(0.0, current - 0.1)
-                    driver.execute_script(f"arguments[0].volume = {new_vol};", video)
-                    return {"success": True, "message": f"Volume {int(new_vol * 100)}%"}
-                else:
-                    driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ARROW_DOWN)
-                    return {"success": True, "message": "Volume down"}
-            
-            elif action == 'fullscreen':
-                try:
-                    btn = driver.find_element(By.CSS_SELECTOR, ".ytp-fullscreen-button")
-                    btn.click()
-                except:
-                    driver.find_element(By.TAG_NAME, "body").send_keys("f")
-                return {"success": True, "message": "Fullscreen"}
-            
-            elif action == 'seek_forward':
-                if video:
-                    current = driver.execute_script("return arguments[0].currentTime;", video)
-                    driver.execute_script(f"arguments[0].currentTime = {current + 10};", video)
-                else:
-                    driver.find_element(By.TAG_NAME, "body").send_keys("l")
-                return {"success": True, "message": "+10s"}
-            
-            elif action == 'seek_backward':
-                if video:
-                    current = driver.execute_script("return arguments[0].currentTime;", video)
-                    driver.execute_script(f"arguments[0].currentTime = {max(0, current - 10)};", video)
-                else:
-                    driver.find_element(By.TAG_NAME, "body").send_keys("j")
-                return {"success": True, "message": "-10s"}
-            
-            elif action == 'skip_ad':
-                skipped = await self._skip_youtube_ads(timeout=5)
-                return {"success": True, "message": "Skipped" if skipped else "No ad"}
-            
-            elif action in ['next', 'next_video']:
-                logger.info("Executing next video action")
-                # Skip any current ad first
-                await self._skip_youtube_ads(timeout=3)
-                
-                # First, click on the video player to ensure it's focused
-                try:
-                    player = driver.find_element(By.CSS_SELECTOR, "#movie_player")
-                    player.click()
-                    await asyncio.sleep(0.3)
-                except:
-                    pass
-                
-                # Method 1: Try clicking next button
-                try:
-                    btn = driver.find_element(By.CSS_SELECTOR, ".ytp-next-button")
-                    if btn.is_displayed() and btn.is_enabled():
-                        btn.click()
-                        logger.info("Clicked next button successfully")
-                        await asyncio.sleep(2)
-                        await self._skip_youtube_ads(timeout=10)
-                        self._start_ad_monitor()  # Restart ad monitor
-                        return {"success": True, "message": "Playing next"}
-                except Exception as e:
-                    logger.debug(f"Next button click failed: {e}")
-                
-                # Method 2: Use keyboard shortcut - Shift+N for next in playlist
-                try:
-                    body = driver.find_element(By.TAG_NAME, "body")
-                    body.send_keys(Keys.SHIFT + "n")
-                    logger.info("Sent Shift+N for next video")
-                    await asyncio.sleep(2)
-                    await self._skip_youtube_ads(timeout=10)
-                    self._start_ad_monitor()
-                    return {"success": True, "message": "Playing next"}
-                except Exception as e:
-                    logger.debug(f"Shift+N failed: {e}")
-                
-                # Method 3: JavaScript click on next button
-                try:
-                    driver.execute_script("document.querySelector('.ytp-next-button').click()")
-                    logger.info("JavaScript clicked next button")
-                    await asyncio.sleep(2)
-                    await self._skip_youtube_ads(timeout=10)
-                    self._start_ad_monitor()
-                    return {"success": True, "message": "Playing next"}
-                except Exception as e:
-                    logger.debug(f"JS next click failed: {e}")
-                
-                return {"success": False, "error": "Could not play next video"}
+            if handler not in self._YT_SELF_LOCATING:
+                video = await self._run(self._find_video, driver, current_url)
             
-            elif action in ['previous', 'prev', 'previous_video']:
-                logger.info("Executing previous video action")
-                # Skip any current ad first
-                await self._skip_youtube_ads(timeout=3)
-                
-                # First, click on the video player to ensure it's focused
-                try:
-                    player = driver.find_element(By.CSS_SELECTOR, "#movie_player")
-                    player.click()
-                    await asyncio.sleep(0.3)
-                except:
-                    pass
-                
-                # Method 1: Try clicking previous button
-                try:
-                    btn = driver.find_element(By.CSS_SELECTOR, ".ytp-prev-button")
-                    if btn.is_displayed() and btn.is_enabled():
-                        btn.click()
-                        logger.info("Clicked previous button successfully")
-                        await asyncio.sleep(2)
-                        await self._skip_youtube_ads(timeout=10)
-                        self._start_ad_monitor()
-                        return {"success": True, "message": "Playing previous"}
-                except Exception as e:
-                    logger.debug(f"Previous button not available: {e}")
-                
-                # Method 2: Use keyboard shortcut Shift+P
-                try:
-                    body = driver.find_element(By.TAG_NAME, "body")
-                    body.send_keys(Keys.SHIFT + "p")
-                    logger.info("Sent Shift+P for previous video")
-                    await asyncio.sleep(2)
-                    await self._skip_youtube_ads(timeout=10)
-                    self._start_ad_monitor()
-                    return {"success": True, "message": "Playing previous"}
-                except Exception as e:
-                    logger.debug(f"Shift+P failed: {e}")
-                
-                # Method 3: Navigate back in browser history
-                try:
-                    driver.back()
-                    logger.info("Navigated back in history")
-                    await asyncio.sleep(2)
-                    await self._skip_youtube_ads(timeout=10)
-                    self._start_ad_monitor()
-                    return {"success": True, "message": "Playing previous"}
-                except Exception as e:
-                    logger.debug(f"Browser back failed: {e}")
-                
-                return {"success": False, "error": "Could not play previous video"}
-            
-            elif action == 'restart':
-                if video:
-                    driver.execute_script("arguments[0].currentTime = 0;", video)
-                else:
-                    driver.find_element(By.TAG_NAME, "body").send_keys("0")
-                return {"success": True, "message": "Restarted"}
-            
-            else:
-                return {"success": False, "error": f"Unknown: {action}"}
+            try:
+                return await handler(self, driver, video)
+            except StaleElementReferenceException:
+                if video is None:
+                    raise
+                # Cached element died with a page reload - look it up once more
+                self._video_elem = None
+                return await handler(self, driver, await self._run(self._find_video, driver, current_url))
             
         except Exception as e:
             logger.error(f"YouTube control error: {e}")
             return {"success": False, "error": str(e)}
     
+    # ---- youtube_control handlers: (self, driver, video) -> result dict ----
+    
+    async def _yt_pause(self, driver, video) -> Dict[str, Any]:
+        if video:
+            await self._run(driver.execute_script, "arguments[0].pause();", video)
+        else:
+            # Use keyboard shortcut
+            await self._run(self._send_keys, "k")
+        return {"success": True, "message": "Paused"}
+    
+    async def _yt_play(self, driver, video) -> Dict[str, Any]:
+        if video:
+            await self._run(driver.execute_script, "arguments[0].play();", video)
+        else:
+            await self._run(self._send_keys, "k")
+        return {"success": True, "message": "Playing"}
+    
+    async def _yt_toggle(self, driver, video) -> Dict[str, Any]:
+        if video:
+            is_paused = await self._run(driver.execute_script, "return arguments[0].paused;", video)
+            if is_paused:
+                await self._run(driver.execute_script, "arguments[0].play();", video)
+                return {"success": True, "message": "Playing"}
+            else:
+                await self._run(driver.execute_script, "arguments[0].pause();", video)
+                return {"success": True, "message": "Paused"}
+        else:
+            await self._run(self._send_keys, "k")
+            return {"success": True, "message": "Toggled"}
+    
+    async def _yt_mute(self, driver, video) -> Dict[str, Any]:
+        if video:
+            await self._run(driver.execute_script, "arguments[0].muted = true;", video)
+        else:
+            await self._run(self._send_keys, "m")
+        return {"success": True, "message": "Muted"}
+    
+    async def _yt_unmute(self, driver, video) -> Dict[str, Any]:
+        if video:
+            await self._run(driver.execute_script, "arguments[0].muted = false;", video)
+        else:
+            await self._run(self._send_keys, "m")
+        return {"success": True, "message": "Unmuted"}
+    
+    async def _yt_volume_up(self, driver, video) -> Dict[str, Any]:
+        new_vol = await self._nudge(driver, "volume", 0.1, 0, 1)
+        if new_vol is not None:
+            return {"success": True, "message": f"Volume {round(new_vol * 100)}%"}
+        else:
+            await self._run(self._send_keys, Keys.ARROW_UP)
+            return {"success": True, "message": "Volume up"}
+    
+    async def _yt_volume_down(self, driver, video) -> Dict[str, Any]:
+        new_vol = await self._nudge(driver, "volume", -0.1, 0, 1)
+        if new_vol is not None:
+            return {"success": True, "message": f"Volume {round(new_vol * 100)}%"}
+        else:
+            await self._run(self._send_keys, Keys.ARROW_DOWN)
+            return {"success": True, "message": "Volume down"}
+    
+    async def _yt_fullscreen(self, driver, video) -> Dict[str, Any]:
+        if not await self._run(self._click_by_class, "ytp-fullscreen-button"):
+            await self._run(self._send_keys, "f")
+        return {"success": True, "message": "Fullscreen"}
+    
+    async def _yt_seek_forward(self, driver, video) -> Dict[str, Any]:
+        if await self._nudge(driver, "currentTime", 10, 0, None) is None:
+            await self._run(self._send_keys, "l")
+        return {"success": True, "message": "+10s"}
+    
+    async def _yt_seek_backward(self, driver, video) -> Dict[str, Any]:
+        if await self._nudge(driver, "currentTime", -10, 0, None) is None:
+            await self._run(self._send_keys, "j")
+        return {"success": True, "message": "-10s"}
+    
+    async def _yt_skip_ad(self, driver, video) -> Dict[str, Any]:
+        skipped = await self._skip_youtube_ads(timeout=5)
+        return {"success": True, "message": "Skipped" if skipped else "No ad"}
+    
+    async def _after_track_change(self, message: str, from_url: str) -> Dict[str, Any]:
+        """Wait for the player to leave from_url, then skip ads and start the new video"""
+        try:
+            await self._run(
+                WebDriverWait(self.driver, 3, poll_frequency=0.1).until,
+                EC.url_changes(from_url),
+            )
+        except TimeoutException:
+            logger.debug("URL unchanged after track change, checking playback anyway")
+        self._url_cache = (0.0, None)
+        await self._wait_for_playback(timeout=10)
+        self._start_ad_monitor()
+        return {"success": True, "message": message}
+    
+    async def _yt_next(self, driver, video) -> Dict[str, Any]:
+        logger.info("Executing next video action")
+        from_url = await self._run(self._current_url)
+        # Skip any current ad first
+        await self._skip_youtube_ads(timeout=3)
+        
+        # First, click on the video player to ensure it's focused
+        try:
+            await self._run(self._focus_player)
+            await asyncio.sleep(0.3)
+        except _ELEMENT_ERRORS:
+            pass
+        
+        # Method 1: Try clicking next button
+        try:
+            if await self._run(self._click_by_class, "ytp-next-button"):
+                logger.info("Clicked next button successfully")
+                return await self._after_track_change("Playing next", from_url)
+        except WebDriverException as e:
+            logger.debug(f"Next button click failed: {e}")
+        
+        # Method 2: Use keyboard shortcut - Shift+N for next in playlist
+        try:
+            await self._run(self._send_keys, Keys.SHIFT + "n")
+            logger.info("Sent Shift+N for next video")
+            return await self._after_track_change("Playing next", from_url)
+        except WebDriverException as e:
+            logger.debug(f"Shift+N failed: {e}")
+        
+        # Method 3: JavaScript click on next button
+        try:
+            await self._run(driver.execute_script, "document.querySelector('.ytp-next-button').click()")
+            logger.info("JavaScript clicked next button")
+            return await self._after_track_change("Playing next", from_url)
+        except WebDriverException as e:
+            logger.debug(f"JS next click failed: {e}")
+        
+        return {"success": False, "error": "Could not play next video"}
+    
+    async def _yt_previous(self, driver, video) -> Dict[str, Any]:
+        logger.info("Executing previous video action")
+        from_url = await self._run(self._current_url)
+        # Skip any current ad first
+        await self._skip_youtube_ads(timeout=3)
+        
+        # First, click on the video player to ensure it's focused
+        try:
+            await self._run(self._focus_player)
+            await asyncio.sleep(0.3)
+        except _ELEMENT_ERRORS:
+            pass
+        
+        # Method 1: Try clicking previous button
+        try:
+            if await self._run(self._click_by_class, "ytp-prev-button"):
+                logger.info("Clicked previous button successfully")
+                return await self._after_track_change("Playing previous", from_url)
+        except WebDriverException as e:
+            logger.debug(f"Previous button not available: {e}")
+        
+        # Method 2: Use keyboard shortcut Shift+P
+        try:
+            await self._run(self._send_keys, Keys.SHIFT + "p")
+            logger.info("Sent Shift+P for previous video")
+            return await self._after_track_change("Playing previous", from_url)
+        except WebDriverException as e:
+            logger.debug(f"Shift+P failed: {e}")
+        
+        # Method 3: Navigate back in browser history
+        try:
+            await self._run(driver.back)
+            logger.info("Navigated back in history")
+            return await self._after_track_change("Playing previous", from_url)
+        except WebDriverException as e:
+            logger.debug(f"Browser back failed: {e}")
+        
+        return {"success": False, "error": "Could not play previous video"}
+    
+    async def _yt_restart(self, driver, video) -> Dict[str, Any]:
+        if video:
+            await self._run(driver.execute_script, "arguments[0].currentTime = 0;", video)
+        else:
+            await self._run(self._send_keys, "0")
+        return {"success": True, "message": "Restarted"}
+    
+    # Handlers that never use the pre-fetched <video> element
+    _YT_SELF_LOCATING = frozenset({
+        _yt_volume_up, _yt_volume_down, _yt_seek_forward, _yt_seek_backward,
+        _yt_fullscreen, _yt_skip_ad, _yt_next, _yt_previous,
+    })
+    
+    _YT_ACTIONS = {
+        'pause': _yt_pause,
+        'stop': _yt_pause,
+        'play': _yt_play,
+        'resume': _yt_play,
+        'toggle': _yt_toggle,
+        'mute': _yt_mute,
+        'unmute': _yt_unmute,
+        'volume_up': _yt_volume_up,
+        'volume_down': _yt_volume_down,
+        'fullscreen': _yt_fullscreen,
+        'seek_forward': _yt_seek_forward,
+        'seek_backward': _yt_seek_backward,
+        'skip_ad': _yt_skip_ad,
+        'next': _yt_next,
+        'next_video': _yt_next,
+        'previous': _yt_previous,
+        'prev': _yt_previous,
+        'previous_video': _yt_previous,
+        'restart': _yt_restart,
+    }
+    
     async def browser_control(self, action: str, url: str = None) -> Dict[str, Any]:
         """Browser controls"""
         action = action.lower().strip()
         
-        if action not in ['new_tab', 'goto', 'open_browser', 'open'] and not self._check_session_valid():
+        # Handlers that go through _get_driver() validate the session themselves
+        if action not in self._DRIVER_OPENING_ACTIONS and not await self._run(self._check_session_valid):
             return {"success": False, "error": "No browser open"}
         
+        handler = self._BROWSER_ACTIONS.get(action)
+        if handler is None:
+            return {"success": False, "error": f"Unknown: {action}"}
+        
         try:
-            if action in ['new_tab', 'open_tab']:
-                driver = self._get_driver()  # Opens browser if not open
-                if not driver:
-                    return {"success": False, "error": "Could not open browser"}
-                # Open new tab
-                driver.execute_script("window.open('about:blank', '_blank');")
-                # Switch to new tab
-                driver.switch_to.window(driver.window_handles[-1])
-                if url:
-                    driver.get(url)
-                return {"success": True, "message": "New tab opened"}
-            
-            elif action in ['open_browser', 'open']:
-                driver = self._get_driver()
-                if not driver:
-                    return {"success": False, "error": "Could not open browser"}
-                if url:
-                    driver.get(url)
-                else:
-                    driver.get("https://www.google.com")
-                return {"success": True, "message": "Browser opened"}
-            
-            elif action == 'close_tab':
-                if len(self.driver.window_handles) > 1:
-                    self.driver.close()
-                    self.driver.switch_to.window(self.driver.window_handles[-1])
-                    return {"success": True, "message": "Tab closed"}
-                else:
-                    # Last tab - close browser
-                    self.driver.quit()
-                    self.driver = None
-                    self._browser_type = None
-                    return {"success": True, "message": "Browser closed"}
-            
-            elif action == 'switch_tab':
-                handles = self.driver.window_handles
-                current = self.driver.current_window_handle
-                idx = (handles.index(current) + 1) % len(handles)
-                self.driver.switch_to.window(handles[idx])
-                return {"success": True, "message": f"Switched to tab {idx + 1}"}
-            
-            elif action == 'back':
-                self.driver.back()
-                return {"success": True, "message": "Back"}
-            
-            elif action == 'forward':
-                self.driver.forward()
-                return {"success": True, "message": "Forward"}
-            
-            elif action == 'refresh':
-                self.driver.refresh()
-                return {"success": True, "message": "Refreshed"}
-            
-            elif action == 'maximize':
-                self.driver.maximize_window()
-                return {"success": True, "message": "Maximized"}
-            
-            elif action == 'minimize':
-                self.driver.minimize_window()
-                return {"success": True, "message": "Minimized"}
-            
-            elif action == 'goto' and url:
-                driver = self._get_driver()
-                if driver:
-                    if not url.startswith('http'):
-                        url = 'https://' + url
-                    driver.get(url)
-                    return {"success": True, "message": "Opened"}
-                return {"success": False, "error": "No browser"}
-            
-            elif action in ['close_browser', 'close', 'quit']:
-                if self.driver:
-                    self.driver.quit()
-                    self.driver = None
-                    self._browser_type = None
-                return {"success": True, "message": "Browser closed"}
-            
-            else:
-                return {"success": False, "error": f"Unknown: {action}"}
-            
+            return await handler(self, url)
         except Exception as e:
             logger.error(f"Browser control error: {e}")
             return {"success": False, "error": str(e)}
+        finally:
+            # Tab switches and history moves change the page behind the URL cache
+            self._url_cache = (0.0, None)
+    
+    # ---- browser_control handlers: (self, url) -> result dict ----
+    
+    async def _br_new_tab(self, url) -> Dict[str, Any]:
+        driver = await self._run(self._get_driver)  # Opens browser if not open
+        if not driver:
+            return {"success": False, "error": "Could not open browser"}
+        # Open and focus a new tab in one WebDriver command - no handle listing
+        await self._run(driver.switch_to.new_window, 'tab')
+        if url:
+            await self._navigate(url)
+        return {"success": True, "message": "New tab opened"}
+    
+    async def _br_open_browser(self, url) -> Dict[str, Any]:
+        driver = await self._run(self._get_driver)
+        if not driver:
+            return {"success": False, "error": "Could not open browser"}
+        if url:
+            await self._navigate(url)
+        else:
+            await self._navigate("https://www.google.com")
+        return {"success": True, "message": "Browser opened"}
+    
+    async def _br_close_tab(self, url) -> Dict[str, Any]:
+        return await self._run(self._close_tab)
+    
+    def _close_tab(self) -> Dict[str, Any]:
+        if len(self.driver.window_handles) > 1:
+            self.driver.close()
+            self.driver.switch_to.window(self.driver.window_handles[-1])
+            return {"success": True, "message": "Tab closed"}
+        else:
+            # Last tab - close browser
+            self._quit_driver()
+            return {"success": True, "message": "Browser closed"}
+    
+    async def _br_switch_tab(self, url) -> Dict[str, Any]:
+        return await self._run(self._switch_tab)
+    
+    def _switch_tab(self) -> Dict[str, Any]:
+        handles = self.driver.window_handles
+        # Start from the real active tab - the user may have switched by hand
+        idx = (handles.index(self.driver.current_window_handle) + 1) % len(handles)
+        self.driver.switch_to.window(handles[idx])
+        return {"success": True, "message": f"Switched to tab {idx + 1}"}
+    
+    async def _br_back(self, url) -> Dict[str, Any]:
+        await self._run(self.driver.back)
+        return {"success": True, "message": "Back"}
+    
+    async def _br_forward(self, url) -> Dict[str, Any]:
+        await self._run(self.driver.forward)
+        return {"success": True, "message": "Forward"}
+    
+    async def _br_refresh(self, url) -> Dict[str, Any]:
+        await self._run(self.driver.refresh)
+        return {"success": True, "message": "Refreshed"}
+    
+    async def _br_maximize(self, url) -> Dict[str, Any]:
+        await self._run(self.driver.maximize_window)
+        return {"success": True, "message": "Maximized"}
+    
+    async def _br_minimize(self, url) -> Dict[str, Any]:
+        await self._run(self.driver.minimize_window)
+        return {"success": True, "message": "Minimized"}
+    
+    async def _br_goto(self, url) -> Dict[str, Any]:
+        if not url:
+            return {"success": False, "error": "Unknown: goto"}
+        driver = await self._run(self._get_driver)
+        if driver:
+            if not url.startswith('http'):
+                url = 'https://' + url
+            await self._navigate(url)
+            return {"success": True, "message": "Opened"}
+        return {"success": False, "error": "No browser"}
+    
+    async def _br_close_browser(self, url) -> Dict[str, Any]:
+        await self._run(self._quit_driver)
+        return {"success": True, "message": "Browser closed"}
+    
+    def _quit_driver(self):
+        """Quit the browser on purpose and forget its session"""
+        if self.driver:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self._clear_saved_session()
+            self.driver = None
+            self._browser_type = None
+    
+    _DRIVER_OPENING_ACTIONS = frozenset({'new_tab', 'open_tab', 'goto', 'open_browser', 'open'})
+    
+    _BROWSER_ACTIONS = {
+        'new_tab': _br_new_tab,
+        'open_tab': _br_new_tab,
+        'open_browser': _br_open_browser,
+        'open': _br_open_browser,
+        'close_tab': _br_close_tab,
+        'switch_tab': _br_switch_tab,
+        'back': _br_back,
+        'forward': _br_forward,
+        'refresh': _br_refresh,
+        'maximize': _br_maximize,
+        'minimize': _br_minimize,
+        'goto': _br_goto,
+        'close_browser': _br_close_browser,
+        'close': _br_close_browser,
+        'quit': _br_close_browser,
+    }
     
     async def google_search(self, query: str) -> Dict[str, Any]:
         """Search Google"""
+        url = f"https://www.google.com/search?q={quote_plus(query)}"
         try:
-            driver = self._get_driver()
+            driver = await self._run(self._get_driver)
             if driver:
-                driver.get(f"https://www.google.com/search?q={query.replace(' ', '+')}")
+                await self._navigate(url)
             else:
-                import webbrowser
-                webbrowser.open(f"https://www.google.com/search?q={query.replace(' ', '+')}")
+                webbrowser.open(url)
             return {"success": True, "message": "Searched"}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
     def get_status(self) -> Dict[str, Any]:
         """Get browser status"""
+        return self._call(self._read_status)
+    
+    def _read_status(self) -> Dict[str, Any]:
         if not self._check_session_valid():
             return {"active": False}
         try:
-            return {
-                "active": True, 
-                "browser": self._browser_type, 
-                "url": self.driver.current_url,
-                "tabs": len(self.driver.window_handles)
-            }
-        except:
+            data = self.driver.execute_script(
+                "return {url: location.href, title: document.title};")
+        except Exception:
+            try:
+                data = {"url": self.driver.current_url, "title": self.driver.title}
+            except Exception:
+                return {"active": False}
+        try:
+            # Read live - the user may have opened or closed tabs by hand
+            tabs = len(self.driver.window_handles)
+        except Exception:
             return {"active": False}
+        return {
+            "active": True, 
+            "browser": self._browser_type, 
+            "url": data["url"],
+            "title": data["title"],
+            "tabs": tabs
+        }
     
     def close(self):
         """Close browser"""
-        if self.driver:
-            try:
-                self.driver.quit()
-            except:
-                pass
-            self.driver = None
-            self._browser_type = None
+        # Stop the monitor first so it cannot keep polling a quitting driver
+        if self._ad_skip_task is not None:
+            self._ad_skip_task.cancel()
+            self._ad_skip_task = None
+        self._call(self._quit_driver)
 
 
 # Global instance
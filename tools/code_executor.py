@@ -2,16 +2,109 @@
 Code Execution and System Control via Open Interpreter
 Enables JARVIS to execute Python code, run system commands, and interact with the OS
 """
+import asyncio
 import subprocess
 import sys
 import os
+import json
+import re
+import select
+import shlex
+import shutil
+import struct
+import threading
+import time
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 from core.logger import setup_logger
 from core.config import settings
 
+try:
+    import pynvml
+except ImportError:
+    # Optional: without NVML bindings GPU info comes from nvidia-smi
+    pynvml = None
+
 logger = setup_logger(__name__)
 
+# Pre-started interpreter that serves one execute_python request (see py_worker.py)
+_WORKER_SCRIPT = str(Path(__file__).with_name("py_worker.py"))
+_WORKER_HEADER = struct.Struct(">I")
+
+# Anything here needs /bin/sh to interpret it; other commands can be exec'd directly
+_SHELL_META = re.compile(r"[|&;<>()$`\\*?\[\]{}~#\n]")
+
+# Fresh workers kept booted ahead of demand; each one runs a single snippet
+_MAX_IDLE_WORKERS = min(4, os.cpu_count() or 1)
+
+# Rapid status polling reuses the last GPU reading for this long
+_GPU_INFO_TTL = 2.0
+
+# Background CPU sampling period for get_system_info
+_CPU_SAMPLE_INTERVAL = 1.0
+
+# file_operations("read") returns at most this many characters
+_MAX_READ_CHARS = 10 * 1024 * 1024
+
+
+def _split_command(command: str) -> Optional[List[str]]:
+    """argv for a command that uses no shell features, else None"""
+    if _SHELL_META.search(command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+    if not argv or '=' in argv[0]:  # VAR=value prefixes need the shell
+        return None
+    if shutil.which(argv[0]) is None:  # Builtins (cd, export...) and typos go to the shell
+        return None
+    return argv
+
+
+class _PythonWorker:
+    """One single-use Python process, spoken to with length-prefixed JSON frames"""
+    
+    def __init__(self):
+        self.proc = subprocess.Popen(
+            [sys.executable, "-u", _WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=0,
+        )
+    
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+    
+    def run(self, code: str, cwd: str, timeout: float) -> Dict[str, Any]:
+        """Send code to the worker and wait for its reply (raises TimeoutExpired)"""
+        deadline = time.monotonic() + timeout
+        body = json.dumps({"code": code, "cwd": cwd}).encode("utf-8")
+        self.proc.stdin.write(_WORKER_HEADER.pack(len(body)) + body)
+        size = _WORKER_HEADER.unpack(self._read(_WORKER_HEADER.size, deadline, timeout))[0]
+        return json.loads(self._read(size, deadline, timeout))
+    
+    def _read(self, size: int, deadline: float, timeout: float) -> bytes:
+        fd = self.proc.stdout.fileno()
+        data = b""
+        while len(data) < size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                raise subprocess.TimeoutExpired(_WORKER_SCRIPT, timeout)
+            chunk = os.read(fd, size - len(data))
+            if not chunk:
+                raise EOFError("Python worker exited")
+            data += chunk
+        return data
+    
+    def kill(self):
+        try:
+            self.proc.kill()
+            self.proc.wait(timeout=1)
+        except Exception:
+            pass
+
 class CodeExecutor:
     """Safe code execution with sandboxing and permissions"""
     
@@ -23,21 +116,64 @@ class CodeExecutor:
         self.forbidden_operations = [
             'rm -rf /', 'sudo ', 'chmod 777', 'dd if=', 'format'
         ]
+        # One pass over the command instead of a substring scan per pattern
+        self._forbidden_re = re.compile("|".join(map(re.escape, self.forbidden_operations)))
+        self._danger_path_re = re.compile(r"/sys|/proc|/dev|/boot")
+        self._mutating_re = re.compile(r"rm|delete")
+        self._idle_workers: List[_PythonWorker] = []
+        self._workers_lock = threading.Lock()
+        self._static_sysinfo: Optional[Dict[str, str]] = None
+        self._last_cpu: Optional[float] = None
+        self._cpu_sampler: Optional[threading.Thread] = None
+        self._stop_sampling = threading.Event()
+        self._nvml_ok: Optional[bool] = None
+        self._gpu_info = "Not available"
+        self._gpu_info_at = 0.0
+    
+    def _acquire_worker(self) -> _PythonWorker:
+        """Take a booted worker (or start one if none is ready) and start its replacement"""
+        worker = None
+        with self._workers_lock:
+            while self._idle_workers and worker is None:
+                candidate = self._idle_workers.pop()
+                if candidate.alive():
+                    worker = candidate
+                else:
+                    candidate.kill()
+            # The replacement boots while this snippet runs, so the next call skips startup too
+            if len(self._idle_workers) < _MAX_IDLE_WORKERS:
+                self._idle_workers.append(_PythonWorker())
+        return worker or _PythonWorker()
+    
+    def close(self):
+        """Stop the CPU sampler and shut down idle Python workers"""
+        self._stop_sampling.set()
+        with self._workers_lock:
+            workers, self._idle_workers = self._idle_workers, []
+        for worker in workers:
+            worker.kill()
+    
+    def _sample_cpu(self):
+        """Keep _last_cpu fresh so status queries never wait on a measurement"""
+        import psutil
+        
+        psutil.cpu_percent(interval=None)
+        while not self._stop_sampling.wait(_CPU_SAMPLE_INTERVAL):
+            self._last_cpu = psutil.cpu_percent(interval=None)
     
     def is_safe_command(self, command: str) -> tuple[bool, str]:
         """Check if system command is safe to execute"""
         command_lower = command.lower()
         
         # Check for dangerous commands
-        for forbidden in self.forbidden_operations:
-            if forbidden in command_lower:
-                return False, f"Dangerous operation detected: {forbidden}"
+        match = self._forbidden_re.search(command_lower)
+        if match:
+            return False, f"Dangerous operation detected: {match.group()}"
         
         # Check for critical system directories
-        dangerous_paths = ['/sys', '/proc', '/dev', '/boot']
-        for path in dangerous_paths:
-            if path in command and ('rm' in command_lower or 'delete' in command_lower):
-                return False, f"Cannot modify critical system directory: {path}"
+        path = self._danger_path_re.search(command)
+        if path and self._mutating_re.search(command_lower):
+            return False, f"Cannot modify critical system directory: {path.group()}"
         
         return True, "Safe to execute"
     
@@ -61,22 +197,18 @@ class CodeExecutor:
         try:
             logger.info(f"Executing Python code ({len(code)} chars)")
             
-            # Create temporary file
-            temp_file = Path("/tmp/jarvis_exec.py")
-            temp_file.write_text(code)
+            if capture_output:
+                return self._execute_in_worker(code, timeout)
             
-            # Execute with timeout
+            # Feed the source on stdin - no shared temp file for concurrent calls to clobber
             result = subprocess.run(
-                [sys.executable, str(temp_file)],
+                [sys.executable, "-"],
+                input=code,
                 capture_output=capture_output,
                 text=True,
-                timeout=timeout,
-                cwd=os.getcwd()
+                timeout=timeout
             )
             
-            # Cleanup
-            temp_file.unlink()
-            
             success = result.returncode == 0
             
             logger.info(f"Python execution {'succeeded' if success else 'failed'} (exit code: {result.returncode})")
@@ -108,6 +240,36 @@ class CodeExecutor:
                 "error": str(e)
             }
     
+    def _execute_in_worker(self, code: str, timeout: int) -> Dict[str, Any]:
+        """Run code in a pre-started worker - no interpreter startup per call"""
+        worker = self._acquire_worker()
+        try:
+            reply = worker.run(code, os.getcwd(), timeout)
+        except EOFError:
+            # The snippet ended the worker process itself (os._exit, fatal signal)
+            exit_code = worker.proc.wait()
+            if exit_code is None:
+                exit_code = -1
+            reply = {
+                "stdout": "",
+                "stderr": f"Python process exited with code {exit_code}" if exit_code else "",
+                "return_code": exit_code,
+            }
+        finally:
+            # Never reused: the snippet may have changed modules, sys or threads
+            worker.kill()
+        
+        success = reply["return_code"] == 0
+        logger.info(f"Python execution {'succeeded' if success else 'failed'} (exit code: {reply['return_code']})")
+        
+        return {
+            "success": success,
+            "stdout": reply["stdout"],
+            "stderr": reply["stderr"],
+            "return_code": reply["return_code"],
+            "error": None if success else reply["stderr"]
+        }
+    
     def execute_system_command(
         self,
         command: str,
@@ -140,21 +302,20 @@ class CodeExecutor:
             
             logger.info(f"Executing system command: {command[:50]}...")
             
-            # Detect if this is an app launch command (contains nohup ... &)
             # For app launches, use Popen to avoid blocking
-            is_background_launch = command.strip().endswith('&') and 'nohup' in command
-            
-            if is_background_launch:
+            if self._is_background_launch(command):
                 # Launch app in background without blocking
                 logger.info("Detected background app launch - using non-blocking execution")
+                # Popen already detaches it (new session, no pipes), so a plain
+                # "nohup app args &" can skip /bin/sh and report the app's real PID
+                argv = _split_command(command.strip()[:-1]) if shell else None
                 process = subprocess.Popen(
-                    command,
-                    shell=shell,
+                    argv or command,
+                    shell=argv is None and shell,
                     stdout=subprocess.DEVNULL,
                     stderr=subprocess.DEVNULL,
                     stdin=subprocess.DEVNULL,
-                    start_new_session=True,  # Detach from parent process
-                    cwd=os.getcwd()
+                    start_new_session=True  # Detach from parent process
                 )
                 # Don't wait for the process - return immediately
                 return {
@@ -167,26 +328,17 @@ class CodeExecutor:
                 }
             
             # For regular commands, use blocking execution
+            # Plain "program args" commands skip the extra /bin/sh process
+            argv = _split_command(command) if shell else None
             result = subprocess.run(
-                command,
+                argv or command,
                 capture_output=True,
                 text=True,
                 timeout=timeout,
-                shell=shell,
-                cwd=os.getcwd()
+                shell=argv is None and shell
             )
             
-            success = result.returncode == 0
-            
-            logger.info(f"Command {'succeeded' if success else 'failed'} (exit code: {result.returncode})")
-            
-            return {
-                "success": success,
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-                "return_code": result.returncode,
-                "error": None if success else result.stderr
-            }
+            return self._command_result(result.returncode, result.stdout, result.stderr)
             
         except subprocess.TimeoutExpired:
             logger.warning(f"Command timed out after {timeout}s")
@@ -207,39 +359,121 @@ class CodeExecutor:
                 "error": str(e)
             }
     
+    async def aexecute_system_command(
+        self,
+        command: str,
+        timeout: int = 30,
+        shell: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Async variant of execute_system_command for use on the event loop
+        
+        Regular commands run as asyncio subprocesses so other requests are
+        served while they finish. Blocked commands and background launches
+        return immediately and go through execute_system_command unchanged.
+        """
+        is_safe, _ = self.is_safe_command(command)
+        if not is_safe or self._is_background_launch(command):
+            return self.execute_system_command(command, timeout, shell)
+        
+        try:
+            logger.info(f"Executing system command: {command[:50]}...")
+            argv = _split_command(command) if shell else [command]
+            if argv is None:
+                process = await asyncio.create_subprocess_shell(
+                    command,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+            else:
+                process = await asyncio.create_subprocess_exec(
+                    *argv,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+            
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                logger.warning(f"Command timed out after {timeout}s")
+                return {
+                    "success": False,
+                    "stdout": "",
+                    "stderr": f"Command timed out after {timeout} seconds",
+                    "return_code": -1,
+                    "error": "Timeout"
+                }
+            
+            return self._command_result(
+                process.returncode,
+                stdout.decode(errors="replace"),
+                stderr.decode(errors="replace")
+            )
+            
+        except Exception as e:
+            logger.error(f"Command execution error: {e}")
+            return {
+                "success": False,
+                "stdout": "",
+                "stderr": str(e),
+                "return_code": -1,
+                "error": str(e)
+            }
+    
+    @staticmethod
+    def _is_background_launch(command: str) -> bool:
+        """App launch commands look like 'nohup app args &'"""
+        stripped = command.strip()
+        return stripped.endswith('&') and not stripped.endswith('&&') and 'nohup' in command
+    
+    @staticmethod
+    def _command_result(return_code: int, stdout: str, stderr: str) -> Dict[str, Any]:
+        success = return_code == 0
+        
+        logger.info(f"Command {'succeeded' if success else 'failed'} (exit code: {return_code})")
+        
+        return {
+            "success": success,
+            "stdout": stdout,
+            "stderr": stderr,
+            "return_code": return_code,
+            "error": None if success else stderr
+        }
+    
     def get_system_info(self) -> Dict[str, Any]:
         """Get system information"""
         try:
             import platform
             import psutil
             
-            cpu_percent = psutil.cpu_percent(interval=1)
+            if self._static_sysinfo is None:
+                # Fixed for the life of the process (platform.processor() forks uname)
+                self._static_sysinfo = {
+                    "os": platform.system(),
+                    "os_version": platform.version(),
+                    "architecture": platform.machine(),
+                    "processor": platform.processor(),
+                    "python_version": platform.python_version(),
+                }
+            
+            if self._cpu_sampler is None and not self._stop_sampling.is_set():
+                self._cpu_sampler = threading.Thread(target=self._sample_cpu, daemon=True)
+                self._cpu_sampler.start()
+            
+            cpu_percent = self._last_cpu
+            if cpu_percent is None:
+                # Sampler has no reading yet; take one short sample instead
+                cpu_percent = psutil.cpu_percent(interval=0.1)
             memory = psutil.virtual_memory()
             disk = psutil.disk_usage('/')
             
-            # GPU info if available
-            gpu_info = "Not available"
-            try:
-                result = subprocess.run(
-                    ['nvidia-smi', '--query-gpu=name,memory.used,memory.total', '--format=csv,noheader,nounits'],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                if result.returncode == 0:
-                    gpu_info = result.stdout.strip()
-            except:
-                pass
+            gpu_info = self._get_gpu_info()
             
             return {
                 "success": True,
-                "system": {
-                    "os": platform.system(),
-                    "os_version": platform.version(),
-                    "architecture": platform.machine(),
-                    "processor": platform.processor(),
-                    "python_version": platform.python_version(),
-                },
+                "system": dict(self._static_sysinfo),
                 "resources": {
                     "cpu_percent": cpu_percent,
                     "memory_percent": memory.percent,
@@ -256,6 +490,52 @@ class CodeExecutor:
                 "error": str(e)
             }
     
+    def _get_gpu_info(self) -> str:
+        """GPU name and memory (MiB) as 'name, used, total' lines, cached briefly"""
+        now = time.monotonic()
+        if self._gpu_info_at and now - self._gpu_info_at < _GPU_INFO_TTL:
+            return self._gpu_info
+        
+        gpu_info = "Not available"
+        if self._nvml_ok is None:
+            try:
+                pynvml.nvmlInit()
+                self._nvml_ok = True
+            except Exception:
+                # Also covers pynvml not being installed
+                self._nvml_ok = False
+        
+        if self._nvml_ok:
+            try:
+                lines = []
+                for index in range(pynvml.nvmlDeviceGetCount()):
+                    handle = pynvml.nvmlDeviceGetHandleByIndex(index)
+                    name = pynvml.nvmlDeviceGetName(handle)
+                    if isinstance(name, bytes):
+                        name = name.decode()
+                    memory = pynvml.nvmlDeviceGetMemoryInfo(handle)
+                    lines.append(f"{name}, {memory.used // 2**20}, {memory.total // 2**20}")
+                if lines:
+                    gpu_info = "\n".join(lines)
+            except Exception as e:
+                logger.debug(f"NVML query failed: {e}")
+        else:
+            try:
+                result = subprocess.run(
+                    ['nvidia-smi', '--query-gpu=name,memory.used,memory.total', '--format=csv,noheader,nounits'],
+                    capture_output=True,
+                    text=True,
+                    timeout=5
+                )
+                if result.returncode == 0:
+                    gpu_info = result.stdout.strip()
+            except Exception:
+                pass
+        
+        self._gpu_info = gpu_info
+        self._gpu_info_at = now
+        return gpu_info
+    
     def file_operations(
         self,
         operation: str,
@@ -276,8 +556,13 @@ class CodeExecutor:
             if operation == "read":
                 if not file_path.exists():
                     return {"success": False, "error": "File not found"}
-                content = file_path.read_text()
-                return {"success": True, "content": content, "size": len(content)}
+                with open(file_path) as f:
+                    content = f.read(_MAX_READ_CHARS)
+                    truncated = bool(f.read(1))
+                result = {"success": True, "content": content, "size": len(content)}
+                if truncated:
+                    result["truncated"] = True
+                return result
             
             elif operation == "write":
                 if content is None:
@@ -289,8 +574,8 @@ class CodeExecutor:
             elif operation == "append":
                 if content is None:
                     return {"success": False, "error": "No content provided"}
-                existing = file_path.read_text() if file_path.exists() else ""
-                file_path.write_text(existing + content)
+                with open(file_path, "a") as f:
+                    f.write(content)
                 return {"success": True, "message": f"Appended to {path}"}
             
             elif operation == "delete":
@@ -304,7 +589,9 @@ class CodeExecutor:
                     return {"success": False, "error": "Directory not found"}
                 if not file_path.is_dir():
                     return {"success": False, "error": "Not a directory"}
-                files = [str(f.name) for f in file_path.iterdir()]
+                # scandir yields names straight from the directory read, no Path per entry
+                with os.scandir(file_path) as entries:
+                    files = [entry.name for entry in entries]
                 return {"success": True, "files": files, "count": len(files)}
             
             else:
@@ -336,6 +623,11 @@ def run_command(command: str) -> Dict[str, Any]:
     return code_executor.execute_system_command(command)
 
 
+async def arun_command(command: str) -> Dict[str, Any]:
+    """Run system command with safety checks without blocking the event loop"""
+    return await code_executor.aexecute_system_command(command)
+
+
 def get_system_status() -> Dict[str, Any]:
     """Get current system status"""
     return code_executor.get_system_info()
@@ -3,12 +3,28 @@ Perplexity AI integration for real-time web search with citations
 """
 import aiohttp
 import asyncio
-from typing import List, Dict, Optional
+import json
+import time
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 from core.config import settings
 from core.logger import setup_logger
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    # Optional speedup - stdlib json works the same, just slower
+    _json_loads = json.loads
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
 logger = setup_logger(__name__)
 
+# Identical searches within this window reuse the previous answer
+_CACHE_TTL = 60.0
+_CACHE_MAX_ENTRIES = 512
+
 class PerplexitySearch:
     """Perplexity AI search integration"""
     
@@ -16,8 +32,30 @@ class PerplexitySearch:
         self.api_key = settings.PERPLEXITY_API_KEY
         self.base_url = "https://api.perplexity.ai/chat/completions"
         self.model = settings.PERPLEXITY_MODEL
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._cache: Dict[Tuple, Tuple[float, Dict]] = {}
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
         logger.info(f"Perplexity initialized (model: {self.model})")
     
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Shared session - keeps the TLS connection to the API alive between searches"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=30),
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json"
+                }
+            )
+        return self._session
+    
+    async def aclose(self):
+        """Close the shared HTTP session (call on shutdown)"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
     async def search(
         self, 
         query: str, 
@@ -35,60 +73,54 @@ class PerplexitySearch:
         Returns:
             Dict with 'answer' and optionally 'citations'
         """
+        key = (query, max_tokens, return_citations)
+        cached = self._cache.get(key)
+        if cached and time.monotonic() - cached[0] < _CACHE_TTL:
+            logger.info(f"Perplexity cache hit: {query[:100]}")
+            return cached[1]
+        
+        # Concurrent identical searches share one request
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._search(query, max_tokens, return_citations))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one caller giving up does not cancel the others
+        return await asyncio.shield(future)
+    
+    async def _search(self, query: str, max_tokens: int, return_citations: bool) -> Dict[str, any]:
         logger.info(f"Perplexity search: {query[:100]}")
         
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                }
+            session = self._get_session()
+            
+            payload = self._build_payload(query, max_tokens, return_citations)
+            
+            # Content-Type is set on the session; encode ourselves to use orjson when present
+            async with session.post(self.base_url, data=_json_dumps(payload)) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    logger.error(f"Perplexity API error {response.status}: {error_text}")
+                    return {
+                        "answer": f"Search error: {response.status}",
+                        "citations": []
+                    }
                 
-                payload = {
-                    "model": self.model,
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "You are a helpful search assistant. Provide accurate, well-cited answers based on current information."
-                        },
-                        {
-                            "role": "user",
-                            "content": query
-                        }
-                    ],
-                    "max_tokens": max_tokens,
-                    "temperature": 0.2,
-                    "return_citations": return_citations,
-                    "search_recency_filter": "month"  # Focus on recent results
+                data = await response.json(loads=_json_loads)
+                answer = data['choices'][0]['message']['content']
+                citations = data.get('citations', [])
+                
+                logger.info(f"Perplexity result: {len(answer)} chars, {len(citations)} citations")
+                
+                result = {
+                    "answer": answer,
+                    "citations": citations,
+                    "model": data.get('model'),
+                    "usage": data.get('usage')
                 }
+                self._remember((query, max_tokens, return_citations), result)
+                return result
                 
-                async with session.post(
-                    self.base_url,
-                    json=payload,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(f"Perplexity API error {response.status}: {error_text}")
-                        return {
-                            "answer": f"Search error: {response.status}",
-                            "citations": []
-                        }
-                    
-                    data = await response.json()
-                    answer = data['choices'][0]['message']['content']
-                    citations = data.get('citations', [])
-                    
-                    logger.info(f"Perplexity result: {len(answer)} chars, {len(citations)} citations")
-                    
-                    return {
-                        "answer": answer,
-                        "citations": citations,
-                        "model": data.get('model'),
-                        "usage": data.get('usage')
-                    }
-                    
         except asyncio.TimeoutError:
             logger.error("Perplexity search timeout")
             return {
@@ -102,6 +134,92 @@ class PerplexitySearch:
                 "citations": []
             }
     
+    def _build_payload(self, query: str, max_tokens: int, return_citations: bool) -> Dict[str, any]:
+        return {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "You are a helpful search assistant. Provide accurate, well-cited answers based on current information."
+                },
+                {
+                    "role": "user",
+                    "content": query
+                }
+            ],
+            "max_tokens": max_tokens,
+            "temperature": 0.2,
+            "return_citations": return_citations,
+            "search_recency_filter": "month"  # Focus on recent results
+        }
+    
+    async def search_stream(self, query: str, max_tokens: int = 1000) -> AsyncIterator[str]:
+        """
+        Stream the answer as it is generated (server-sent events)
+        
+        Yields text chunks so callers can start speaking/displaying before the
+        full answer is ready. Results are not cached; use search() for that.
+        """
+        logger.info(f"Perplexity stream: {query[:100]}")
+        
+        payload = self._build_payload(query, max_tokens, return_citations=False)
+        payload["stream"] = True
+        
+        try:
+            session = self._get_session()
+            async with session.post(self.base_url, data=_json_dumps(payload)) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    logger.error(f"Perplexity API error {response.status}: {error_text}")
+                    yield f"Search error: {response.status}"
+                    return
+                
+                async for line in response.content:
+                    line = line.strip()
+                    if not line.startswith(b"data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == b"[DONE]":
+                        break
+                    for choice in _json_loads(data).get('choices', []):
+                        text = choice.get('delta', {}).get('content')
+                        if text:
+                            yield text
+                            
+        except asyncio.TimeoutError:
+            logger.error("Perplexity stream timeout")
+            yield "Search timed out. Please try again."
+        except Exception as e:
+            logger.error(f"Perplexity stream error: {e}")
+            yield f"Search error: {str(e)}"
+    
+    def _remember(self, key: Tuple, result: Dict):
+        """Cache a successful answer; errors are never cached"""
+        self._cache.pop(key, None)
+        self._cache[key] = (time.monotonic(), result)
+        while len(self._cache) > _CACHE_MAX_ENTRIES:
+            # Dicts keep insertion order, so the first key is the oldest
+            del self._cache[next(iter(self._cache))]
+    
+    async def multi_search(self, queries: List[str], concurrency: int = 8) -> List[Dict[str, any]]:
+        """
+        Run several searches concurrently over the shared session
+        
+        Args:
+            queries: Search queries
+            concurrency: Max requests in flight at once
+            
+        Returns:
+            One search() result per query, in the same order
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def search_one(query: str) -> Dict[str, any]:
+            async with semaphore:
+                return await self.search(query)
+        
+        return await asyncio.gather(*(search_one(query) for query in queries))
+    
     async def quick_search(self, query: str) -> str:
         """Quick search returning just the answer text"""
         result = await self.search(query, max_tokens=500)
@@ -0,0 +1,116 @@
+"""
+Pre-started Python worker for CodeExecutor
+Boots ahead of time and waits for one code snippet from JARVIS on stdin, so an
+execution skips interpreter startup. Each worker runs a single snippet and exits,
+leaving no state behind for the next one.
+
+Protocol: every message is a 4-byte big-endian length followed by a UTF-8 JSON body.
+Request:  {"code": str, "cwd": str}
+Response: {"stdout": str, "stderr": str, "return_code": int}
+"""
+import atexit
+import json
+import os
+import struct
+import sys
+import tempfile
+import threading
+import traceback
+
+_HEADER = struct.Struct(">I")
+
+
+def _read_exact(fd: int, size: int) -> bytes:
+    """Read exactly size bytes from fd, or b'' if the parent went away"""
+    data = b""
+    while len(data) < size:
+        chunk = os.read(fd, size - len(data))
+        if not chunk:
+            return b""
+        data += chunk
+    return data
+
+
+def _exec(code: str) -> int:
+    """Execute code like `python script.py` would and return its exit code"""
+    try:
+        exec(compile(code, "<jarvis>", "exec"), {"__name__": "__main__", "__builtins__": __builtins__})
+        return 0
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        if isinstance(e.code, int):
+            return e.code
+        print(e.code, file=sys.stderr)
+        return 1
+    except BaseException:
+        traceback.print_exc()
+        return 1
+
+
+def _join_threads():
+    """Wait for the snippet's non-daemon threads, as interpreter exit would"""
+    while True:
+        pending = [t for t in threading.enumerate()
+                   if t is not threading.main_thread() and not t.daemon and t.is_alive()]
+        if not pending:
+            return
+        for thread in pending:
+            thread.join()
+
+
+def _run(request: dict, out, err) -> dict:
+    """Run one request with fds 1/2 pointed at the scratch files so child processes are captured too"""
+    saved_out, saved_err = os.dup(1), os.dup(2)
+    os.dup2(out.fileno(), 1)
+    os.dup2(err.fileno(), 2)
+    try:
+        os.chdir(request.get("cwd") or os.getcwd())
+        return_code = _exec(request["code"])
+        # Threads and atexit hooks still belong to the run - their output too
+        _join_threads()
+        atexit._run_exitfuncs()
+    finally:
+        for stream in (sys.stdout, sys.stderr, sys.__stdout__, sys.__stderr__):
+            try:
+                stream.flush()
+            except Exception:
+                pass  # Closed or replaced by the snippet
+        os.dup2(saved_out, 1)
+        os.dup2(saved_err, 2)
+        os.close(saved_out)
+        os.close(saved_err)
+    out.seek(0)
+    err.seek(0)
+    return {
+        "stdout": out.read().decode("utf-8", "replace"),
+        "stderr": err.read().decode("utf-8", "replace"),
+        "return_code": return_code,
+    }
+
+
+def main():
+    # Keep the protocol pipes private: user code sees /dev/null on stdin and stdout
+    requests_fd, replies_fd = os.dup(0), os.dup(1)
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    os.close(devnull)
+
+    # Same view of the world as `python -`
+    sys.argv = ["-"]
+    
+    # Scratch files are made while idle, before the request arrives
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        header = _read_exact(requests_fd, _HEADER.size)
+        if not header:
+            return
+        request = json.loads(_read_exact(requests_fd, _HEADER.unpack(header)[0]))
+        reply = json.dumps(_run(request, out, err)).encode("utf-8")
+    message = memoryview(_HEADER.pack(len(reply)) + reply)
+    while message:
+        message = message[os.write(replies_fd, message):]
+
+
+if __name__ == "__main__":
+    main()
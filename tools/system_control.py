@@ -2,15 +2,67 @@
 System Control Tool for JARVIS
 Provides OS-level controls: volume, brightness, screenshots, power management, etc.
 """
+import asyncio
+import functools
 import subprocess
 import os
+import re
+import shutil
 import datetime
 import threading
-from typing import Dict, Any, Optional
+import time
+from typing import Callable, Dict, Any, List, Optional, Tuple, Union
 from core.logger import setup_logger
 
+try:
+    import pulsectl
+except ImportError:
+    # Optional: without libpulse bindings volume goes through wpctl/pactl/amixer
+    pulsectl = None
+
 logger = setup_logger(__name__)
 
+# First "NN%" in pactl/amixer volume output
+_VOL_RE = re.compile(r"(\d+)%")
+
+# set-mute command per CLI backend; the last argument comes from _MUTE_ARG
+_MUTE_COMMANDS = {
+    "wpctl": ["wpctl", "set-mute", "@DEFAULT_AUDIO_SINK@"],
+    "pactl": ["pactl", "set-sink-mute", "@DEFAULT_SINK@"],
+    "amixer": ["amixer", "-D", "pulse", "sset", "Master"],
+}
+_MUTE_ARG = {
+    ("wpctl", "mute"): "1", ("wpctl", "unmute"): "0", ("wpctl", "toggle"): "toggle",
+    ("pactl", "mute"): "true", ("pactl", "unmute"): "false", ("pactl", "toggle"): "toggle",
+    ("amixer", "mute"): "mute", ("amixer", "unmute"): "unmute", ("amixer", "toggle"): "toggle",
+}
+# (success message, fallback error) per mute op
+_MUTE_MESSAGES = {
+    "mute": ("System muted", "Failed to mute"),
+    "unmute": ("System unmuted", "Failed to unmute"),
+    "toggle": ("Mute toggled", "Failed to toggle mute"),
+}
+
+# How long a get_volume reading is reused; any volume change drops it immediately
+_VOLUME_TTL = 0.2
+
+# Re-read the xrandr output name after this long, in case monitors were swapped
+_XRANDR_OUTPUT_TTL = 60.0
+
+# Screen lockers in order of preference: GNOME screensaver, loginctl (systemd),
+# xdg-screensaver, GNOME ScreenSaver over D-Bus, dm-tool
+_LOCK_COMMANDS = (
+    ["gnome-screensaver-command", "-l"],
+    ["loginctl", "lock-session"],
+    ["xdg-screensaver", "lock"],
+    ["dbus-send", "--type=method_call", "--dest=org.gnome.ScreenSaver",
+     "/org/gnome/ScreenSaver", "org.gnome.ScreenSaver.Lock"],
+    ["dm-tool", "lock"],
+)
+
+# Default screenshot directory
+_PICTURES = os.path.expanduser("~/Pictures")
+
 # Global storage for timers/reminders
 _active_timers = {}
 _active_reminders = {}
@@ -24,14 +76,60 @@ class SystemControl:
     """System-level controls for JARVIS voice assistant"""
     
     def __init__(self):
+        self._volume_backend: Optional[str] = None
+        self._binaries: Dict[str, bool] = {}
+        self._pulse = None
+        self._pulse_lock = threading.Lock()
+        self._backend_lock = threading.Lock()
+        self._vol_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._xrandr_output: Optional[str] = None
+        self._xrandr_output_at = 0.0
+        self._locker: Optional[List[str]] = None
+        self._dispatch = self._build_dispatch()
+        # Probe the audio stack in the background so the first volume command doesn't wait on it
+        threading.Thread(target=self._get_volume_backend, name="volume-probe", daemon=True).start()
         logger.info("SystemControl initialized")
     
-    def _run_command(self, command: str, timeout: int = 10) -> Dict[str, Any]:
-        """Run a shell command and return result"""
+    def refresh_backends(self):
+        """Forget detected backends (e.g. after installing PipeWire) so the next call re-probes"""
+        self._volume_backend = None
+        self._binaries.clear()
+        self._vol_cache = None
+        self._close_pulse()
+    
+    def _has(self, binary: str) -> bool:
+        """Whether a program is on PATH - looked up in-process and cached, no `which` subprocess"""
+        found = self._binaries.get(binary)
+        if found is None:
+            found = self._binaries[binary] = shutil.which(binary) is not None
+        return found
+    
+    def _run_command(self, command: Union[str, List[str]], timeout: int = 10, capture: bool = True) -> Dict[str, Any]:
+        """
+        Run a command and return result
+        
+        An argv list is exec'd directly; a string goes through /bin/sh and is
+        only needed for pipes, redirects and other shell syntax.
+        With capture=False output is discarded and only success/code come back,
+        for commands run purely for their effect.
+        """
+        if not isinstance(command, str) and not self._has(command[0]):
+            # Known-missing tool: answer from the PATH cache instead of spawning
+            return {"success": False, "error": f"{command[0]} is not installed"}
         try:
+            if not capture:
+                # No pipes to set up and drain
+                code = subprocess.run(
+                    command,
+                    shell=isinstance(command, str),
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    timeout=timeout
+                ).returncode
+                return {"success": code == 0, "code": code}
             result = subprocess.run(
                 command,
-                shell=True,
+                shell=isinstance(command, str),
                 capture_output=True,
                 text=True,
                 timeout=timeout
@@ -50,34 +148,92 @@ class SystemControl:
     # ==================== VOLUME CONTROLS ====================
     
     def _get_volume_backend(self) -> str:
-        """Detect audio backend: wpctl (PipeWire), pactl (PulseAudio), or amixer (ALSA)"""
+        """Detect audio backend: pulsectl (libpulse), wpctl (PipeWire), pactl (PulseAudio), or amixer (ALSA)"""
+        # Probing costs several subprocesses; the answer doesn't change within a session
+        backend = self._volume_backend
+        if backend is None:
+            with self._backend_lock:
+                # A call racing the startup probe waits for it instead of probing twice
+                backend = self._volume_backend
+                if backend is None:
+                    backend = self._volume_backend = self._detect_volume_backend()
+                    logger.info(f"Volume backend: {backend}")
+        return backend
+    
+    def _detect_volume_backend(self) -> str:
+        # Persistent libpulse connection - no process per volume change.
+        # Works with PulseAudio and with PipeWire's pulse server.
+        if pulsectl is not None:
+            try:
+                self._pulse = pulsectl.Pulse("jarvis")
+                return "pulsectl"
+            except Exception as e:
+                logger.debug(f"libpulse connection failed: {e}")
+        
         # Check for PipeWire (wpctl)
-        result = self._run_command("which wpctl")
-        if result["success"]:
+        if self._has("wpctl"):
             # Verify wpctl works
-            test = self._run_command("wpctl get-volume @DEFAULT_AUDIO_SINK@")
+            test = self._run_command(["wpctl", "get-volume", "@DEFAULT_AUDIO_SINK@"])
             if test["success"]:
                 return "wpctl"
         
         # Check for PulseAudio (pactl)
-        result = self._run_command("which pactl")
-        if result["success"]:
+        if self._has("pactl"):
             return "pactl"
         
         # Fallback to ALSA (amixer)
         return "amixer"
     
+    def _close_pulse(self):
+        with self._pulse_lock:
+            if self._pulse is not None:
+                try:
+                    self._pulse.close()
+                except Exception:
+                    pass
+                self._pulse = None
+    
+    def _pulse_call(self, action) -> Dict[str, Any]:
+        """Run action(pulse, default_sink) on the libpulse connection, shaped like _run_command's result"""
+        try:
+            with self._pulse_lock:
+                pulse = self._pulse
+                if pulse is None:
+                    # Closed under us (refresh_backends or an earlier failure)
+                    raise pulsectl.PulseDisconnected("libpulse connection closed")
+                sink = pulse.get_sink_by_name(pulse.server_info().default_sink_name)
+                value = action(pulse, sink)
+            return {"success": True, "value": value}
+        except (pulsectl.PulseError, pulsectl.PulseDisconnected) as e:
+            # Connection lost (audio server restarted?) - re-detect on the next call
+            logger.warning(f"libpulse call failed: {e}")
+            self._close_pulse()
+            self._volume_backend = None
+            return {"success": False, "error": str(e)}
+        except Exception as e:
+            # Bad argument or similar - the connection itself is fine, keep it
+            logger.debug(f"libpulse action failed: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def _volume_cmd(self, backend: str, wpctl: List[str], pactl: List[str], amixer: List[str]) -> Dict[str, Any]:
+        """Run the argv matching a CLI volume backend; anything else gets the ALSA (amixer) one"""
+        argv = wpctl if backend == "wpctl" else pactl if backend == "pactl" else amixer
+        return self._run_command(argv, capture=False)
+    
     def volume_up(self, amount: int = 10) -> Dict[str, Any]:
         """Increase system volume"""
+        self._vol_cache = None
         backend = self._get_volume_backend()
         
-        if backend == "wpctl":
-            # wpctl uses decimal values (0.1 = 10%)
-            result = self._run_command(f"wpctl set-volume @DEFAULT_AUDIO_SINK@ {amount}%+")
-        elif backend == "pactl":
-            result = self._run_command(f"pactl set-sink-volume @DEFAULT_SINK@ +{amount}%")
+        if backend == "pulsectl":
+            result = self._pulse_call(lambda pulse, sink: pulse.volume_change_all_chans(sink, amount / 100))
         else:
-            result = self._run_command(f"amixer -D pulse sset Master {amount}%+")
+            result = self._volume_cmd(
+                backend,
+                ["wpctl", "set-volume", "@DEFAULT_AUDIO_SINK@", f"{amount}%+"],
+                ["pactl", "set-sink-volume", "@DEFAULT_SINK@", f"+{amount}%"],
+                ["amixer", "-D", "pulse", "sset", "Master", f"{amount}%+"],
+            )
         
         if result["success"]:
             return {"success": True, "message": f"Volume increased by {amount}%"}
@@ -85,14 +241,18 @@ class SystemControl:
     
     def volume_down(self, amount: int = 10) -> Dict[str, Any]:
         """Decrease system volume"""
+        self._vol_cache = None
         backend = self._get_volume_backend()
         
-        if backend == "wpctl":
-            result = self._run_command(f"wpctl set-volume @DEFAULT_AUDIO_SINK@ {amount}%-")
-        elif backend == "pactl":
-            result = self._run_command(f"pactl set-sink-volume @DEFAULT_SINK@ -{amount}%")
+        if backend == "pulsectl":
+            result = self._pulse_call(lambda pulse, sink: pulse.volume_change_all_chans(sink, -amount / 100))
         else:
-            result = self._run_command(f"amixer -D pulse sset Master {amount}%-")
+            result = self._volume_cmd(
+                backend,
+                ["wpctl", "set-volume", "@DEFAULT_AUDIO_SINK@", f"{amount}%-"],
+                ["pactl", "set-sink-volume", "@DEFAULT_SINK@", f"-{amount}%"],
+                ["amixer", "-D", "pulse", "sset", "Master", f"{amount}%-"],
+            )
         
         if result["success"]:
             return {"success": True, "message": f"Volume decreased by {amount}%"}
@@ -100,73 +260,74 @@ class SystemControl:
     
     def volume_set(self, level: int) -> Dict[str, Any]:
         """Set system volume to specific level (0-100)"""
+        self._vol_cache = None
         level = max(0, min(100, level))
         backend = self._get_volume_backend()
         
-        if backend == "wpctl":
-            # wpctl uses decimal (0.5 = 50%)
-            decimal_level = level / 100
-            result = self._run_command(f"wpctl set-volume @DEFAULT_AUDIO_SINK@ {decimal_level}")
-        elif backend == "pactl":
-            result = self._run_command(f"pactl set-sink-volume @DEFAULT_SINK@ {level}%")
+        if backend == "pulsectl":
+            result = self._pulse_call(lambda pulse, sink: pulse.volume_set_all_chans(sink, level / 100))
         else:
-            result = self._run_command(f"amixer -D pulse sset Master {level}%")
+            result = self._volume_cmd(
+                backend,
+                # wpctl uses decimal (0.5 = 50%)
+                ["wpctl", "set-volume", "@DEFAULT_AUDIO_SINK@", str(level / 100)],
+                ["pactl", "set-sink-volume", "@DEFAULT_SINK@", f"{level}%"],
+                ["amixer", "-D", "pulse", "sset", "Master", f"{level}%"],
+            )
         
         if result["success"]:
             return {"success": True, "message": f"Volume set to {level}%"}
         return {"success": False, "error": result.get("error", "Failed to set volume")}
     
-    def volume_mute(self) -> Dict[str, Any]:
-        """Mute system volume"""
+    def _set_mute(self, op: str) -> Dict[str, Any]:
+        """Mute, unmute or toggle (op) the default sink on whichever backend is active"""
+        self._vol_cache = None
         backend = self._get_volume_backend()
         
-        if backend == "wpctl":
-            result = self._run_command("wpctl set-mute @DEFAULT_AUDIO_SINK@ 1")
-        elif backend == "pactl":
-            result = self._run_command("pactl set-sink-mute @DEFAULT_SINK@ true")
+        if backend == "pulsectl":
+            state = {"mute": True, "unmute": False}.get(op)
+            result = self._pulse_call(lambda pulse, sink: pulse.mute(sink, not sink.mute if state is None else state))
         else:
-            result = self._run_command("amixer -D pulse sset Master mute")
+            cli = backend if backend in _MUTE_COMMANDS else "amixer"
+            result = self._run_command(_MUTE_COMMANDS[cli] + [_MUTE_ARG[cli, op]], capture=False)
         
+        message, error = _MUTE_MESSAGES[op]
         if result["success"]:
-            return {"success": True, "message": "System muted"}
-        return {"success": False, "error": result.get("error", "Failed to mute")}
+            return {"success": True, "message": message}
+        return {"success": False, "error": result.get("error", error)}
+    
+    def volume_mute(self) -> Dict[str, Any]:
+        """Mute system volume"""
+        return self._set_mute("mute")
     
     def volume_unmute(self) -> Dict[str, Any]:
         """Unmute system volume"""
-        backend = self._get_volume_backend()
-        
-        if backend == "wpctl":
-            result = self._run_command("wpctl set-mute @DEFAULT_AUDIO_SINK@ 0")
-        elif backend == "pactl":
-            result = self._run_command("pactl set-sink-mute @DEFAULT_SINK@ false")
-        else:
-            result = self._run_command("amixer -D pulse sset Master unmute")
-        
-        if result["success"]:
-            return {"success": True, "message": "System unmuted"}
-        return {"success": False, "error": result.get("error", "Failed to unmute")}
+        return self._set_mute("unmute")
     
     def volume_toggle_mute(self) -> Dict[str, Any]:
         """Toggle system mute"""
-        backend = self._get_volume_backend()
-        
-        if backend == "wpctl":
-            result = self._run_command("wpctl set-mute @DEFAULT_AUDIO_SINK@ toggle")
-        elif backend == "pactl":
-            result = self._run_command("pactl set-sink-mute @DEFAULT_SINK@ toggle")
-        else:
-            result = self._run_command("amixer -D pulse sset Master toggle")
-        
-        if result["success"]:
-            return {"success": True, "message": "Mute toggled"}
-        return {"success": False, "error": result.get("error", "Failed to toggle mute")}
+        return self._set_mute("toggle")
     
     def get_volume(self) -> Dict[str, Any]:
         """Get current volume level"""
-        backend = self._get_volume_backend()
-        
-        if backend == "wpctl":
-            result = self._run_command("wpctl get-volume @DEFAULT_AUDIO_SINK@")
+        # A slider or status poll can ask many times a second; serve those from the last read
+        cached = self._vol_cache
+        if cached is not None and time.monotonic() - cached[0] < _VOLUME_TTL:
+            return cached[1]
+        result = self._read_volume(self._get_volume_backend())
+        if result["success"]:
+            self._vol_cache = (time.monotonic(), result)
+        return result
+    
+    def _read_volume(self, backend: str) -> Dict[str, Any]:        
+        if backend == "pulsectl":
+            result = self._pulse_call(lambda pulse, sink: (pulse.volume_get_all_chans(sink), sink.mute))
+            if result["success"]:
+                vol, muted = result["value"]
+                status = f"{round(vol * 100)}%" + (" (muted)" if muted else "")
+                return {"success": True, "volume": status, "message": f"Current volume: {status}"}
+        elif backend == "wpctl":
+            result = self._run_command(["wpctl", "get-volume", "@DEFAULT_AUDIO_SINK@"])
             if result["success"] and result["stdout"]:
                 # Parse "Volume: 0.50" to "50%"
                 try:
@@ -177,16 +338,18 @@ class SystemControl:
                         muted = "[MUTED]" in volume_str
                         status = f"{vol_percent}%" + (" (muted)" if muted else "")
                         return {"success": True, "volume": status, "message": f"Current volume: {status}"}
-                except:
-                    pass
-        elif backend == "pactl":
-            result = self._run_command("pactl get-sink-volume @DEFAULT_SINK@ | grep -oP '\\d+%' | head -1")
-            if result["success"] and result["stdout"]:
-                return {"success": True, "volume": result["stdout"], "message": f"Current volume: {result['stdout']}"}
+                except (ValueError, IndexError):
+                    logger.debug(f"Unexpected wpctl output: {result['stdout']!r}")
         else:
-            result = self._run_command("amixer -D pulse sget Master | grep -oP '\\d+%' | head -1")
-            if result["success"] and result["stdout"]:
-                return {"success": True, "volume": result["stdout"], "message": f"Current volume: {result['stdout']}"}
+            if backend == "pactl":
+                result = self._run_command(["pactl", "get-sink-volume", "@DEFAULT_SINK@"])
+            else:
+                result = self._run_command(["amixer", "-D", "pulse", "sget", "Master"])
+            # Parsed here rather than piping through grep/head in a shell
+            match = _VOL_RE.search(result.get("stdout", "")) if result["success"] else None
+            if match:
+                volume = match.group()
+                return {"success": True, "volume": volume, "message": f"Current volume: {volume}"}
         
         return {"success": False, "error": "Could not get volume level"}
     
@@ -195,19 +358,38 @@ class SystemControl:
     def brightness_up(self, amount: int = 10) -> Dict[str, Any]:
         """Increase screen brightness"""
         # Try brightnessctl first, then xrandr
-        result = self._run_command(f"brightnessctl set +{amount}%")
-        if result["success"]:
-            return {"success": True, "message": f"Brightness increased by {amount}%"}
+        if self._has("brightnessctl"):
+            result = self._run_command(["brightnessctl", "set", f"+{amount}%"], capture=False)
+            if result["success"]:
+                return {"success": True, "message": f"Brightness increased by {amount}%"}
         
         # Fallback to xrandr (software brightness)
-        result = self._run_command("xrandr --output $(xrandr | grep ' connected' | head -1 | cut -d' ' -f1) --brightness 1.0")
-        if result["success"]:
-            return {"success": True, "message": "Brightness increased"}
+        output = self._primary_output()
+        if output:
+            result = self._run_command(["xrandr", "--output", output, "--brightness", "1.0"], capture=False)
+            if result["success"]:
+                return {"success": True, "message": "Brightness increased"}
         return {"success": False, "error": "Failed to increase brightness. Install brightnessctl."}
     
+    def _primary_output(self) -> Optional[str]:
+        """Name of the primary xrandr output (first monitor if none is primary), cached"""
+        now = time.monotonic()
+        if self._xrandr_output and now - self._xrandr_output_at < _XRANDR_OUTPUT_TTL:
+            return self._xrandr_output
+        if not self._has("xrandr"):
+            return None
+        
+        result = self._run_command(["xrandr", "--listmonitors"])
+        # Lines look like " 0: +*eDP-1 1920/344x1080/194+0+0  eDP-1"; '*' marks the primary
+        monitors = [line.split() for line in result.get("stdout", "").splitlines()[1:] if line.strip()]
+        primary = next((m for m in monitors if "*" in m[1]), monitors[0] if monitors else None)
+        self._xrandr_output = primary[-1] if primary else None
+        self._xrandr_output_at = now
+        return self._xrandr_output
+    
     def brightness_down(self, amount: int = 10) -> Dict[str, Any]:
         """Decrease screen brightness"""
-        result = self._run_command(f"brightnessctl set {amount}%-")
+        result = self._run_command(["brightnessctl", "set", f"{amount}%-"], capture=False)
         if result["success"]:
             return {"success": True, "message": f"Brightness decreased by {amount}%"}
         return {"success": False, "error": "Failed to decrease brightness. Install brightnessctl."}
@@ -215,7 +397,7 @@ class SystemControl:
     def brightness_set(self, level: int) -> Dict[str, Any]:
         """Set brightness to specific level (0-100)"""
         level = max(1, min(100, level))
-        result = self._run_command(f"brightnessctl set {level}%")
+        result = self._run_command(["brightnessctl", "set", f"{level}%"], capture=False)
         if result["success"]:
             return {"success": True, "message": f"Brightness set to {level}%"}
         return {"success": False, "error": "Failed to set brightness. Install brightnessctl."}
@@ -225,50 +407,52 @@ class SystemControl:
     def take_screenshot(self, filename: str = None, area: str = "full") -> Dict[str, Any]:
         """Take a screenshot - tries multiple methods"""
         if filename is None:
-            import datetime
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
             # Ensure Pictures directory exists
-            pictures_dir = os.path.expanduser("~/Pictures")
-            os.makedirs(pictures_dir, exist_ok=True)
-            filename = f"{pictures_dir}/screenshot_{timestamp}.png"
-        else:
+            os.makedirs(_PICTURES, exist_ok=True)
+            filename = f"{_PICTURES}/screenshot_{timestamp}.png"
+        elif filename.startswith("~"):
             filename = os.path.expanduser(filename)
         
         # Method 1: gnome-screenshot (most common on Ubuntu/GNOME)
-        if area == "full":
-            result = self._run_command(f"gnome-screenshot -f '{filename}'")
-        elif area == "window":
-            result = self._run_command(f"gnome-screenshot -w -f '{filename}'")
-        elif area == "select":
-            result = self._run_command(f"gnome-screenshot -a -f '{filename}'")
-        else:
-            result = self._run_command(f"gnome-screenshot -f '{filename}'")
-        
-        if result["success"] and os.path.exists(filename):
-            return {"success": True, "message": f"Screenshot saved"}
+        if self._has("gnome-screenshot"):
+            if area == "full":
+                result = self._run_command(["gnome-screenshot", "-f", filename], capture=False)
+            elif area == "window":
+                result = self._run_command(["gnome-screenshot", "-w", "-f", filename], capture=False)
+            elif area == "select":
+                result = self._run_command(["gnome-screenshot", "-a", "-f", filename], capture=False)
+            else:
+                result = self._run_command(["gnome-screenshot", "-f", filename], capture=False)
+            
+            if result["success"] and os.path.exists(filename):
+                return {"success": True, "message": f"Screenshot saved"}
         
         # Method 2: scrot
-        if area == "full":
-            result = self._run_command(f"scrot '{filename}'")
-        elif area == "window":
-            result = self._run_command(f"scrot -u '{filename}'")
-        elif area == "select":
-            result = self._run_command(f"scrot -s '{filename}'")
-        else:
-            result = self._run_command(f"scrot '{filename}'")
-        
-        if result["success"] and os.path.exists(filename):
-            return {"success": True, "message": f"Screenshot saved"}
+        if self._has("scrot"):
+            if area == "full":
+                result = self._run_command(["scrot", filename], capture=False)
+            elif area == "window":
+                result = self._run_command(["scrot", "-u", filename], capture=False)
+            elif area == "select":
+                result = self._run_command(["scrot", "-s", filename], capture=False)
+            else:
+                result = self._run_command(["scrot", filename], capture=False)
+            
+            if result["success"] and os.path.exists(filename):
+                return {"success": True, "message": f"Screenshot saved"}
         
         # Method 3: import (ImageMagick)
-        result = self._run_command(f"import -window root '{filename}'")
-        if result["success"] and os.path.exists(filename):
-            return {"success": True, "message": f"Screenshot saved"}
+        if self._has("import"):
+            result = self._run_command(["import", "-window", "root", filename], capture=False)
+            if result["success"] and os.path.exists(filename):
+                return {"success": True, "message": f"Screenshot saved"}
         
         # Method 4: grim (for Wayland)
-        result = self._run_command(f"grim '{filename}'")
-        if result["success"] and os.path.exists(filename):
-            return {"success": True, "message": f"Screenshot saved"}
+        if self._has("grim"):
+            result = self._run_command(["grim", filename], capture=False)
+            if result["success"] and os.path.exists(filename):
+                return {"success": True, "message": f"Screenshot saved"}
         
         return {"success": False, "error": "Screenshot failed. Install gnome-screenshot or scrot."}
     
@@ -276,47 +460,31 @@ class SystemControl:
     
     def lock_screen(self) -> Dict[str, Any]:
         """Lock the screen - tries multiple methods"""
-        # Method 1: GNOME screensaver
-        result = self._run_command("gnome-screensaver-command -l")
-        if result["success"]:
-            return {"success": True, "message": "Locked"}
-        
-        # Method 2: loginctl (systemd)
-        result = self._run_command("loginctl lock-session")
-        if result["success"]:
-            return {"success": True, "message": "Locked"}
-        
-        # Method 3: xdg-screensaver
-        result = self._run_command("xdg-screensaver lock")
-        if result["success"]:
-            return {"success": True, "message": "Locked"}
+        # The locker that worked last time goes first, so usually only one command runs
+        candidates = [self._locker] if self._locker else []
+        candidates += [argv for argv in _LOCK_COMMANDS if argv is not self._locker]
         
-        # Method 4: dbus
-        result = self._run_command("dbus-send --type=method_call --dest=org.gnome.ScreenSaver /org/gnome/ScreenSaver org.gnome.ScreenSaver.Lock")
-        if result["success"]:
-            return {"success": True, "message": "Locked"}
-        
-        # Method 5: dm-tool
-        result = self._run_command("dm-tool lock")
-        if result["success"]:
-            return {"success": True, "message": "Locked"}
+        for argv in candidates:
+            if self._has(argv[0]) and self._run_command(argv, capture=False)["success"]:
+                self._locker = argv
+                return {"success": True, "message": "Locked"}
         
         return {"success": False, "error": "Could not lock screen"}
     
     def suspend(self) -> Dict[str, Any]:
         """Suspend/sleep the system"""
         # Method 1: systemctl (most reliable)
-        result = self._run_command("systemctl suspend")
+        result = self._run_command(["systemctl", "suspend"], capture=False)
         if result["success"]:
             return {"success": True, "message": "Suspending"}
         
         # Method 2: pm-suspend
-        result = self._run_command("pm-suspend")
+        result = self._run_command(["pm-suspend"], capture=False)
         if result["success"]:
             return {"success": True, "message": "Suspending"}
         
         # Method 3: dbus
-        result = self._run_command("dbus-send --system --print-reply --dest=org.freedesktop.login1 /org/freedesktop/login1 org.freedesktop.login1.Manager.Suspend boolean:true")
+        result = self._run_command(["dbus-send", "--system", "--print-reply", "--dest=org.freedesktop.login1", "/org/freedesktop/login1", "org.freedesktop.login1.Manager.Suspend", "boolean:true"], capture=False)
         if result["success"]:
             return {"success": True, "message": "Suspending"}
         
@@ -324,11 +492,11 @@ class SystemControl:
     
     def hibernate(self) -> Dict[str, Any]:
         """Hibernate the system"""
-        result = self._run_command("systemctl hibernate")
+        result = self._run_command(["systemctl", "hibernate"], capture=False)
         if result["success"]:
             return {"success": True, "message": "Hibernating"}
         
-        result = self._run_command("pm-hibernate")
+        result = self._run_command(["pm-hibernate"], capture=False)
         if result["success"]:
             return {"success": True, "message": "Hibernating"}
         
@@ -338,20 +506,20 @@ class SystemControl:
         """Shutdown the system"""
         # Use gnome-session-quit for GNOME (shows dialog)
         if delay == 0:
-            result = self._run_command("gnome-session-quit --power-off")
+            result = self._run_command(["gnome-session-quit", "--power-off"], capture=False)
             if result["success"]:
                 return {"success": True, "message": "Shutting down"}
             
             # Direct shutdown
-            result = self._run_command("systemctl poweroff")
+            result = self._run_command(["systemctl", "poweroff"], capture=False)
             if result["success"]:
                 return {"success": True, "message": "Shutting down"}
             
-            result = self._run_command("shutdown now")
+            result = self._run_command(["shutdown", "now"], capture=False)
             if result["success"]:
                 return {"success": True, "message": "Shutting down"}
         else:
-            result = self._run_command(f"shutdown +{delay}")
+            result = self._run_command(["shutdown", f"+{delay}"], capture=False)
             if result["success"]:
                 return {"success": True, "message": f"Shutdown in {delay} min"}
         
@@ -360,19 +528,19 @@ class SystemControl:
     def restart(self, delay: int = 0) -> Dict[str, Any]:
         """Restart/reboot the system"""
         if delay == 0:
-            result = self._run_command("gnome-session-quit --reboot")
+            result = self._run_command(["gnome-session-quit", "--reboot"], capture=False)
             if result["success"]:
                 return {"success": True, "message": "Restarting"}
             
-            result = self._run_command("systemctl reboot")
+            result = self._run_command(["systemctl", "reboot"], capture=False)
             if result["success"]:
                 return {"success": True, "message": "Restarting"}
             
-            result = self._run_command("shutdown -r now")
+            result = self._run_command(["shutdown", "-r", "now"], capture=False)
             if result["success"]:
                 return {"success": True, "message": "Restarting"}
         else:
-            result = self._run_command(f"shutdown -r +{delay}")
+            result = self._run_command(["shutdown", "-r", f"+{delay}"], capture=False)
             if result["success"]:
                 return {"success": True, "message": f"Restart in {delay} min"}
         
@@ -380,7 +548,7 @@ class SystemControl:
     
     def cancel_shutdown(self) -> Dict[str, Any]:
         """Cancel scheduled shutdown"""
-        result = self._run_command("shutdown -c")
+        result = self._run_command(["shutdown", "-c"], capture=False)
         if result["success"]:
             return {"success": True, "message": "Shutdown cancelled"}
         return {"success": False, "error": "No shutdown scheduled or failed to cancel"}
@@ -389,21 +557,21 @@ class SystemControl:
     
     def wifi_on(self) -> Dict[str, Any]:
         """Enable WiFi"""
-        result = self._run_command("nmcli radio wifi on")
+        result = self._run_command(["nmcli", "radio", "wifi", "on"], capture=False)
         if result["success"]:
             return {"success": True, "message": "WiFi enabled"}
         return {"success": False, "error": "Failed to enable WiFi"}
     
     def wifi_off(self) -> Dict[str, Any]:
         """Disable WiFi"""
-        result = self._run_command("nmcli radio wifi off")
+        result = self._run_command(["nmcli", "radio", "wifi", "off"], capture=False)
         if result["success"]:
             return {"success": True, "message": "WiFi disabled"}
         return {"success": False, "error": "Failed to disable WiFi"}
     
     def wifi_status(self) -> Dict[str, Any]:
         """Get WiFi status"""
-        result = self._run_command("nmcli radio wifi")
+        result = self._run_command(["nmcli", "radio", "wifi"])
         if result["success"]:
             status = result["stdout"]
             return {"success": True, "status": status, "message": f"WiFi is {status}"}
@@ -411,14 +579,14 @@ class SystemControl:
     
     def bluetooth_on(self) -> Dict[str, Any]:
         """Enable Bluetooth"""
-        result = self._run_command("bluetoothctl power on")
+        result = self._run_command(["bluetoothctl", "power", "on"], capture=False)
         if result["success"]:
             return {"success": True, "message": "Bluetooth enabled"}
         return {"success": False, "error": "Failed to enable Bluetooth"}
     
     def bluetooth_off(self) -> Dict[str, Any]:
         """Disable Bluetooth"""
-        result = self._run_command("bluetoothctl power off")
+        result = self._run_command(["bluetoothctl", "power", "off"], capture=False)
         if result["success"]:
             return {"success": True, "message": "Bluetooth disabled"}
         return {"success": False, "error": "Failed to disable Bluetooth"}
@@ -431,7 +599,7 @@ class SystemControl:
             app_lower = app_name.lower().strip()
             
             # Check if window exists
-            check = self._run_command(f"xdotool search --name '{app_lower}'")
+            check = self._run_command(["xdotool", "search", "--name", app_lower])
             if not check.get("stdout", "").strip():
                 # Try wmctrl
                 check = self._run_command(f"wmctrl -l | grep -i '{app_lower}'")
@@ -439,11 +607,11 @@ class SystemControl:
                     return {"success": False, "error": f"No window found matching '{app_name}'"}
             
             # Method 1: xdotool search with case-insensitive name and minimize
-            self._run_command(f"xdotool search --name '{app_lower}' windowminimize")
+            self._run_command(["xdotool", "search", "--name", app_lower, "windowminimize"], capture=False)
             return {"success": True, "message": "Minimized"}
         
         # Minimize active window
-        self._run_command("xdotool getactivewindow windowminimize")
+        self._run_command(["xdotool", "getactivewindow", "windowminimize"], capture=False)
         return {"success": True, "message": "Minimized"}
     
     def maximize_window(self, app_name: str = None) -> Dict[str, Any]:
@@ -452,7 +620,7 @@ class SystemControl:
             app_lower = app_name.lower().strip()
             
             # Check if window exists
-            check = self._run_command(f"xdotool search --name '{app_lower}'")
+            check = self._run_command(["xdotool", "search", "--name", app_lower])
             if not check.get("stdout", "").strip():
                 # Try wmctrl
                 check = self._run_command(f"wmctrl -l | grep -i '{app_lower}'")
@@ -460,35 +628,35 @@ class SystemControl:
                     return {"success": False, "error": f"No window found matching '{app_name}'"}
             
             # Activate the window first
-            self._run_command(f"xdotool search --name '{app_lower}' windowactivate")
+            self._run_command(["xdotool", "search", "--name", app_lower, "windowactivate"], capture=False)
             
             # Now maximize the active window
-            self._run_command("wmctrl -r :ACTIVE: -b add,maximized_vert,maximized_horz")
+            self._run_command(["wmctrl", "-r", ":ACTIVE:", "-b", "add,maximized_vert,maximized_horz"], capture=False)
             return {"success": True, "message": "Maximized"}
         
         # Maximize active window
-        self._run_command("wmctrl -r :ACTIVE: -b add,maximized_vert,maximized_horz")
+        self._run_command(["wmctrl", "-r", ":ACTIVE:", "-b", "add,maximized_vert,maximized_horz"], capture=False)
         return {"success": True, "message": "Maximized"}
     
     def close_window(self, app_name: str = None) -> Dict[str, Any]:
         """Close active window or specific app window"""
         if app_name:
-            result = self._run_command(f"wmctrl -c '{app_name}'")
+            result = self._run_command(["wmctrl", "-c", app_name], capture=False)
             if result["success"]:
                 return {"success": True, "message": "Closed"}
             
             # Try pkill for the app
-            result = self._run_command(f"pkill -f '{app_name}'")
+            result = self._run_command(["pkill", "-f", app_name], capture=False)
             if result["success"]:
                 return {"success": True, "message": "Closed"}
         
         # Close active window
-        result = self._run_command("xdotool getactivewindow windowclose")
+        result = self._run_command(["xdotool", "getactivewindow", "windowclose"], capture=False)
         if result["success"]:
             return {"success": True, "message": "Closed"}
         
         # Fallback: Alt+F4
-        result = self._run_command("xdotool key alt+F4")
+        result = self._run_command(["xdotool", "key", "alt+F4"], capture=False)
         if result["success"]:
             return {"success": True, "message": "Closed"}
         
@@ -496,11 +664,11 @@ class SystemControl:
     
     def focus_window(self, app_name: str) -> Dict[str, Any]:
         """Bring a window to focus"""
-        result = self._run_command(f"wmctrl -a '{app_name}'")
+        result = self._run_command(["wmctrl", "-a", app_name], capture=False)
         if result["success"]:
             return {"success": True, "message": f"Focused {app_name}"}
         
-        result = self._run_command(f"xdotool search --name '{app_name}' windowactivate")
+        result = self._run_command(["xdotool", "search", "--name", app_name, "windowactivate"], capture=False)
         if result["success"]:
             return {"success": True, "message": f"Focused {app_name}"}
         
@@ -508,7 +676,7 @@ class SystemControl:
     
     def list_windows(self) -> Dict[str, Any]:
         """List all open windows"""
-        result = self._run_command("wmctrl -l")
+        result = self._run_command(["wmctrl", "-l"])
         if result["success"]:
             return {"success": True, "windows": result["stdout"], "message": "Windows listed"}
         return {"success": False, "error": "Could not list windows. Install wmctrl."}
@@ -555,7 +723,7 @@ class SystemControl:
         app_lower = app_name.lower().strip()
         
         # Check if any windows match before trying to close
-        check_result = self._run_command(f"xdotool search --name '{app_lower}'")
+        check_result = self._run_command(["xdotool", "search", "--name", app_lower])
         windows_before = check_result.get("stdout", "").strip().split("\n") if check_result.get("stdout") else []
         windows_before = [w for w in windows_before if w]  # Remove empty strings
         
@@ -566,17 +734,16 @@ class SystemControl:
                 return {"success": False, "error": f"No window found matching '{app_name}'"}
         
         # Method 1: Try wmctrl -c directly
-        self._run_command(f"wmctrl -c '{app_name}'")
+        self._run_command(["wmctrl", "-c", app_name], capture=False)
         
         # Method 2: Try xdotool search and close (runs on all matching windows)
-        self._run_command(f"xdotool search --name '{app_lower}' windowclose")
+        self._run_command(["xdotool", "search", "--name", app_lower, "windowclose"], capture=False)
         
         # Small delay to allow window to close
-        import time
         time.sleep(0.3)
         
         # Verify the window is actually closed
-        check_result = self._run_command(f"xdotool search --name '{app_lower}'")
+        check_result = self._run_command(["xdotool", "search", "--name", app_lower])
         windows_after = check_result.get("stdout", "").strip().split("\n") if check_result.get("stdout") else []
         windows_after = [w for w in windows_after if w]
         
@@ -584,11 +751,11 @@ class SystemControl:
             return {"success": True, "message": "Closed"}
         
         # Method 3: Try pkill with pattern matching (last resort)
-        self._run_command(f"pkill -fi '{app_lower}'")
+        self._run_command(["pkill", "-fi", app_lower], capture=False)
         
         # Final check
         time.sleep(0.2)
-        check_result = self._run_command(f"xdotool search --name '{app_lower}'")
+        check_result = self._run_command(["xdotool", "search", "--name", app_lower])
         windows_final = check_result.get("stdout", "").strip() if check_result.get("stdout") else ""
         
         if not windows_final:
@@ -600,40 +767,54 @@ class SystemControl:
     
     def copy_to_clipboard(self, text: str) -> Dict[str, Any]:
         """Copy text to clipboard"""
-        try:
-            process = subprocess.Popen(
-                ['xclip', '-selection', 'clipboard'],
-                stdin=subprocess.PIPE
-            )
-            process.communicate(input=text.encode())
-            if process.returncode == 0:
-                return {"success": True, "message": "Text copied to clipboard"}
-        except:
-            pass
+        if self._has("xclip"):
+            try:
+                if self._pipe_to_clipboard(['xclip', '-selection', 'clipboard'], text):
+                    return {"success": True, "message": "Text copied to clipboard"}
+            except (OSError, UnicodeError) as e:
+                logger.debug(f"xclip copy failed: {e}")
         
         # Fallback to xsel
-        try:
-            process = subprocess.Popen(
-                ['xsel', '--clipboard', '--input'],
-                stdin=subprocess.PIPE
-            )
-            process.communicate(input=text.encode())
-            if process.returncode == 0:
-                return {"success": True, "message": "Text copied to clipboard"}
-        except:
-            pass
+        if self._has("xsel"):
+            try:
+                if self._pipe_to_clipboard(['xsel', '--clipboard', '--input'], text):
+                    return {"success": True, "message": "Text copied to clipboard"}
+            except (OSError, UnicodeError) as e:
+                logger.debug(f"xsel copy failed: {e}")
         
         return {"success": False, "error": "Failed to copy. Install xclip or xsel."}
     
+    def _pipe_to_clipboard(self, argv: List[str], text: str) -> bool:
+        """Hand text to a clipboard tool without waiting for it to give up the selection"""
+        process = subprocess.Popen(
+            argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+        try:
+            process.stdin.write(text.encode())
+        finally:
+            process.stdin.close()
+        try:
+            # Quick failures (no display, etc.) still show up here
+            return process.wait(timeout=0.5) == 0
+        except subprocess.TimeoutExpired:
+            # Still running means it is serving the selection
+            return True
+    
     def get_clipboard(self) -> Dict[str, Any]:
         """Get clipboard content"""
-        result = self._run_command("xclip -selection clipboard -o")
-        if result["success"]:
-            return {"success": True, "content": result["stdout"], "message": "Clipboard content retrieved"}
+        if self._has("xclip"):
+            result = self._run_command(["xclip", "-selection", "clipboard", "-o"], timeout=2)
+            if result["success"]:
+                return {"success": True, "content": result["stdout"], "message": "Clipboard content retrieved"}
         
-        result = self._run_command("xsel --clipboard --output")
-        if result["success"]:
-            return {"success": True, "content": result["stdout"], "message": "Clipboard content retrieved"}
+        if self._has("xsel"):
+            result = self._run_command(["xsel", "--clipboard", "--output"], timeout=2)
+            if result["success"]:
+                return {"success": True, "content": result["stdout"], "message": "Clipboard content retrieved"}
         
         return {"success": False, "error": "Failed to get clipboard. Install xclip or xsel."}
     
@@ -641,7 +822,7 @@ class SystemControl:
     
     def send_notification(self, title: str, message: str, urgency: str = "normal") -> Dict[str, Any]:
         """Send a desktop notification"""
-        result = self._run_command(f'notify-send -u {urgency} "{title}" "{message}"')
+        result = self._run_command(["notify-send", "-u", urgency, title, message], capture=False)
         if result["success"]:
             return {"success": True, "message": "Notification sent"}
         return {"success": False, "error": "Failed to send notification. Install libnotify."}
@@ -693,7 +874,7 @@ class SystemControl:
             return {"success": False, "error": "File not found"}
         
         # Try to move to trash first (safer)
-        result = self._run_command(f"gio trash '{filepath}'")
+        result = self._run_command(["gio", "trash", filepath], capture=False)
         if result["success"]:
             return {"success": True, "message": "Moved to trash"}
         
@@ -713,7 +894,6 @@ class SystemControl:
             return {"success": False, "error": "Source not found"}
         
         try:
-            import shutil
             shutil.move(source, destination)
             return {"success": True, "message": "Moved"}
         except Exception as e:
@@ -728,7 +908,6 @@ class SystemControl:
             return {"success": False, "error": "Source not found"}
         
         try:
-            import shutil
             if os.path.isdir(source):
                 shutil.copytree(source, destination)
             else:
@@ -746,7 +925,6 @@ class SystemControl:
         
         try:
             stat = os.stat(filepath)
-            import datetime
             size = stat.st_size
             if size >= 1024*1024*1024:
                 size_str = f"{size/(1024*1024*1024):.1f} GB"
@@ -800,11 +978,11 @@ class SystemControl:
         """Open file manager at specified path"""
         path = os.path.expanduser(path)
         
-        result = self._run_command(f"xdg-open '{path}'")
+        result = self._run_command(["xdg-open", path], capture=False)
         if result["success"]:
             return {"success": True, "message": "Opened"}
         
-        result = self._run_command(f"nautilus '{path}'")
+        result = self._run_command(["nautilus", path], capture=False)
         if result["success"]:
             return {"success": True, "message": "Opened"}
         
@@ -856,7 +1034,7 @@ class SystemControl:
             # Send notification when timer completes
             self.send_notification("JARVIS Timer", f"{timer_name} completed!", "critical")
             # Play a sound
-            self._run_command("paplay /usr/share/sounds/freedesktop/stereo/complete.oga 2>/dev/null || paplay /usr/share/sounds/gnome/default/alerts/glass.ogg 2>/dev/null")
+            self._run_command("paplay /usr/share/sounds/freedesktop/stereo/complete.oga 2>/dev/null || paplay /usr/share/sounds/gnome/default/alerts/glass.ogg 2>/dev/null", capture=False)
             _active_timers.pop(timer_id, None)
         
         timer = threading.Timer(seconds, timer_callback)
@@ -932,7 +1110,7 @@ class SystemControl:
         
         def reminder_callback():
             self.send_notification("JARVIS Reminder", message, "critical")
-            self._run_command("paplay /usr/share/sounds/freedesktop/stereo/message.oga 2>/dev/null")
+            self._run_command("paplay /usr/share/sounds/freedesktop/stereo/message.oga 2>/dev/null", capture=False)
             _active_reminders.pop(reminder_id, None)
         
         timer = threading.Timer(seconds, reminder_callback)
@@ -1098,7 +1276,7 @@ class SystemControl:
             self.send_notification("JARVIS Alarm", message, "critical")
             # Play alarm sound multiple times
             for _ in range(3):
-                self._run_command("paplay /usr/share/sounds/freedesktop/stereo/alarm-clock-elapsed.oga 2>/dev/null || paplay /usr/share/sounds/gnome/default/alerts/drip.ogg 2>/dev/null")
+                self._run_command("paplay /usr/share/sounds/freedesktop/stereo/alarm-clock-elapsed.oga 2>/dev/null || paplay /usr/share/sounds/gnome/default/alerts/drip.ogg 2>/dev/null", capture=False)
             _active_alarms.pop(alarm_id, None)
         
         timer = threading.Timer(seconds_until, alarm_callback)
@@ -1181,7 +1359,7 @@ class SystemControl:
             info["disk"] = result["stdout"].strip()
         
         # Uptime
-        result = self._run_command("uptime -p")
+        result = self._run_command(["uptime", "-p"])
         if result["success"]:
             info["uptime"] = result["stdout"].strip()
         
@@ -1310,6 +1488,147 @@ class SystemControl:
     
     # ==================== GENERAL SYSTEM CONTROL ====================
     
+    async def aexecute_control(self, action: str, **kwargs) -> Dict[str, Any]:
+        """
+        execute_control for async callers
+        
+        Controls shell out to helper programs (and some sleep while waiting
+        for windows to close), so they run on a worker thread to keep the
+        event loop - and speech I/O - responsive.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(self.execute_control, action, **kwargs)
+        )
+    
+    def _build_dispatch(self) -> Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]]:
+        """Action name (and aliases) -> handler taking execute_control's kwargs"""
+        return {
+            # Time and date
+            'get_time': lambda kw: self.get_time(),
+            'time': lambda kw: self.get_time(),
+            'what_time': lambda kw: self.get_time(),
+            'get_date': lambda kw: self.get_date(),
+            'date': lambda kw: self.get_date(),
+            'what_date': lambda kw: self.get_date(),
+            'get_datetime': lambda kw: self.get_datetime(),
+            'datetime': lambda kw: self.get_datetime(),
+            
+            # Timers
+            'set_timer': lambda kw: self.set_timer(kw.get('seconds', 60), kw.get('name')),
+            'timer': lambda kw: self.set_timer(kw.get('seconds', 60), kw.get('name')),
+            'cancel_timer': lambda kw: self.cancel_timer(kw.get('timer_id')),
+            'list_timers': lambda kw: self.list_timers(),
+            
+            # Reminders
+            'set_reminder': lambda kw: self.set_reminder(kw.get('message', 'Reminder'), kw.get('seconds', 60)),
+            'reminder': lambda kw: self.set_reminder(kw.get('message', 'Reminder'), kw.get('seconds', 60)),
+            'cancel_reminder': lambda kw: self.cancel_reminder(kw.get('reminder_id')),
+            'list_reminders': lambda kw: self.list_reminders(),
+            
+            # Stopwatch
+            'start_stopwatch': lambda kw: self.start_stopwatch(),
+            'stop_stopwatch': lambda kw: self.stop_stopwatch(),
+            'reset_stopwatch': lambda kw: self.reset_stopwatch(),
+            'get_stopwatch': lambda kw: self.get_stopwatch(),
+            
+            # Alarms
+            'set_alarm': lambda kw: self.set_alarm(kw.get('hour', 8), kw.get('minute', 0), kw.get('message', 'Alarm!')),
+            'cancel_alarm': lambda kw: self.cancel_alarm(kw.get('alarm_id')),
+            'list_alarms': lambda kw: self.list_alarms(),
+            
+            # System info
+            'get_system_info': lambda kw: self.get_system_info(),
+            'system_info': lambda kw: self.get_system_info(),
+            'system_status': lambda kw: self.get_system_info(),
+            'get_cpu_usage': lambda kw: self.get_cpu_usage(),
+            'cpu_usage': lambda kw: self.get_cpu_usage(),
+            'cpu': lambda kw: self.get_cpu_usage(),
+            'get_memory_usage': lambda kw: self.get_memory_usage(),
+            'memory_usage': lambda kw: self.get_memory_usage(),
+            'ram': lambda kw: self.get_memory_usage(),
+            'memory': lambda kw: self.get_memory_usage(),
+            'get_gpu_status': lambda kw: self.get_gpu_status(),
+            'gpu_status': lambda kw: self.get_gpu_status(),
+            'gpu': lambda kw: self.get_gpu_status(),
+            'get_battery': lambda kw: self.get_battery_status(),
+            'battery': lambda kw: self.get_battery_status(),
+            'battery_status': lambda kw: self.get_battery_status(),
+            'get_disk_usage': lambda kw: self.get_disk_usage(),
+            'disk_usage': lambda kw: self.get_disk_usage(),
+            'disk': lambda kw: self.get_disk_usage(),
+            'get_network_info': lambda kw: self.get_network_info(),
+            'network_info': lambda kw: self.get_network_info(),
+            'network': lambda kw: self.get_network_info(),
+            'ip': lambda kw: self.get_network_info(),
+            
+            # Volume controls
+            'volume_up': lambda kw: self.volume_up(kw.get('amount', 10)),
+            'volume_down': lambda kw: self.volume_down(kw.get('amount', 10)),
+            'volume_set': lambda kw: self.volume_set(kw.get('level', 50)),
+            'mute': lambda kw: self.volume_mute(),
+            'volume_mute': lambda kw: self.volume_mute(),
+            'unmute': lambda kw: self.volume_unmute(),
+            'volume_unmute': lambda kw: self.volume_unmute(),
+            'toggle_mute': lambda kw: self.volume_toggle_mute(),
+            'get_volume': lambda kw: self.get_volume(),
+            
+            # Brightness controls
+            'brightness_up': lambda kw: self.brightness_up(kw.get('amount', 10)),
+            'brightness_down': lambda kw: self.brightness_down(kw.get('amount', 10)),
+            'brightness_set': lambda kw: self.brightness_set(kw.get('level', 50)),
+            
+            # Screenshot
+            'screenshot': lambda kw: self.take_screenshot(kw.get('filename'), kw.get('area', 'full')),
+            
+            # Power management
+            'lock': lambda kw: self.lock_screen(),
+            'lock_screen': lambda kw: self.lock_screen(),
+            'sleep': lambda kw: self.suspend(),
+            'suspend': lambda kw: self.suspend(),
+            'hibernate': lambda kw: self.hibernate(),
+            'shutdown': lambda kw: self.shutdown(kw.get('delay', 0)),
+            'restart': lambda kw: self.restart(kw.get('delay', 0)),
+            'reboot': lambda kw: self.restart(kw.get('delay', 0)),
+            'cancel_shutdown': lambda kw: self.cancel_shutdown(),
+            
+            # Network
+            'wifi_on': lambda kw: self.wifi_on(),
+            'wifi_off': lambda kw: self.wifi_off(),
+            'wifi_status': lambda kw: self.wifi_status(),
+            'bluetooth_on': lambda kw: self.bluetooth_on(),
+            'bluetooth_off': lambda kw: self.bluetooth_off(),
+            
+            # Window management
+            'minimize_window': lambda kw: self.minimize_window(kw.get('app_name')),
+            'maximize_window': lambda kw: self.maximize_window(kw.get('app_name')),
+            'close_window': lambda kw: self.close_window(kw.get('app_name')),
+            'focus_window': lambda kw: self.focus_window(kw.get('app_name', '')),
+            'list_windows': lambda kw: self.list_windows(),
+            
+            # App management
+            'open_app': lambda kw: self.open_app(kw.get('app_name', '')),
+            'close_app': lambda kw: self.close_app(kw.get('app_name', '')),
+            
+            # Clipboard
+            'copy': lambda kw: self.copy_to_clipboard(kw.get('text', '')),
+            'paste': lambda kw: self.get_clipboard(),
+            'get_clipboard': lambda kw: self.get_clipboard(),
+            
+            # Notifications
+            'notify': lambda kw: self.send_notification(kw.get('title', 'JARVIS'), kw.get('message', ''), kw.get('urgency', 'normal')),
+            
+            # File management
+            'find_file': lambda kw: self.find_file(kw.get('name', ''), kw.get('path', '~')),
+            'find_large_files': lambda kw: self.find_large_files(kw.get('min_size', '100M'), kw.get('path', '~')),
+            'create_file': lambda kw: self.create_file(kw.get('filepath', ''), kw.get('content', '')),
+            'delete_file': lambda kw: self.delete_file(kw.get('filepath', '')),
+            'move_file': lambda kw: self.move_file(kw.get('source', ''), kw.get('destination', '')),
+            'copy_file': lambda kw: self.copy_file(kw.get('source', ''), kw.get('destination', '')),
+            'file_info': lambda kw: self.get_file_info(kw.get('filepath', '')),
+            'list_dir': lambda kw: self.list_directory(kw.get('path', '.')),
+            'open_file_manager': lambda kw: self.open_file_manager(kw.get('path', '~')),
+        }
+    
     def execute_control(self, action: str, **kwargs) -> Dict[str, Any]:
         """
         Execute a system control action
@@ -1330,172 +1649,10 @@ class SystemControl:
         """
         action = action.lower().strip().replace(' ', '_')
         
-        # Time and date
-        if action in ['get_time', 'time', 'what_time']:
-            return self.get_time()
-        elif action in ['get_date', 'date', 'what_date']:
-            return self.get_date()
-        elif action in ['get_datetime', 'datetime']:
-            return self.get_datetime()
-        
-        # Timers
-        elif action in ['set_timer', 'timer']:
-            return self.set_timer(kwargs.get('seconds', 60), kwargs.get('name'))
-        elif action == 'cancel_timer':
-            return self.cancel_timer(kwargs.get('timer_id'))
-        elif action == 'list_timers':
-            return self.list_timers()
-        
-        # Reminders
-        elif action in ['set_reminder', 'reminder']:
-            return self.set_reminder(kwargs.get('message', 'Reminder'), kwargs.get('seconds', 60))
-        elif action == 'cancel_reminder':
-            return self.cancel_reminder(kwargs.get('reminder_id'))
-        elif action == 'list_reminders':
-            return self.list_reminders()
-        
-        # Stopwatch
-        elif action == 'start_stopwatch':
-            return self.start_stopwatch()
-        elif action == 'stop_stopwatch':
-            return self.stop_stopwatch()
-        elif action == 'reset_stopwatch':
-            return self.reset_stopwatch()
-        elif action == 'get_stopwatch':
-            return self.get_stopwatch()
-        
-        # Alarms
-        elif action == 'set_alarm':
-            return self.set_alarm(kwargs.get('hour', 8), kwargs.get('minute', 0), kwargs.get('message', 'Alarm!'))
-        elif action == 'cancel_alarm':
-            return self.cancel_alarm(kwargs.get('alarm_id'))
-        elif action == 'list_alarms':
-            return self.list_alarms()
-        
-        # System info
-        elif action in ['get_system_info', 'system_info', 'system_status']:
-            return self.get_system_info()
-        elif action in ['get_cpu_usage', 'cpu_usage', 'cpu']:
-            return self.get_cpu_usage()
-        elif action in ['get_memory_usage', 'memory_usage', 'ram', 'memory']:
-            return self.get_memory_usage()
-        elif action in ['get_gpu_status', 'gpu_status', 'gpu']:
-            return self.get_gpu_status()
-        elif action in ['get_battery', 'battery', 'battery_status']:
-            return self.get_battery_status()
-        elif action in ['get_disk_usage', 'disk_usage', 'disk']:
-            return self.get_disk_usage()
-        elif action in ['get_network_info', 'network_info', 'network', 'ip']:
-            return self.get_network_info()
-        
-        # Volume controls
-        elif action == 'volume_up':
-            return self.volume_up(kwargs.get('amount', 10))
-        elif action == 'volume_down':
-            return self.volume_down(kwargs.get('amount', 10))
-        elif action == 'volume_set':
-            return self.volume_set(kwargs.get('level', 50))
-        elif action in ['mute', 'volume_mute']:
-            return self.volume_mute()
-        elif action in ['unmute', 'volume_unmute']:
-            return self.volume_unmute()
-        elif action == 'toggle_mute':
-            return self.volume_toggle_mute()
-        elif action == 'get_volume':
-            return self.get_volume()
-        
-        # Brightness controls
-        elif action == 'brightness_up':
-            return self.brightness_up(kwargs.get('amount', 10))
-        elif action == 'brightness_down':
-            return self.brightness_down(kwargs.get('amount', 10))
-        elif action == 'brightness_set':
-            return self.brightness_set(kwargs.get('level', 50))
-        
-        # Screenshot
-        elif action == 'screenshot':
-            return self.take_screenshot(kwargs.get('filename'), kwargs.get('area', 'full'))
-        
-        # Power management
-        elif action in ['lock', 'lock_screen']:
-            return self.lock_screen()
-        elif action in ['sleep', 'suspend']:
-            return self.suspend()
-        elif action == 'hibernate':
-            return self.hibernate()
-        elif action == 'shutdown':
-            return self.shutdown(kwargs.get('delay', 0))
-        elif action in ['restart', 'reboot']:
-            return self.restart(kwargs.get('delay', 0))
-        elif action == 'cancel_shutdown':
-            return self.cancel_shutdown()
-        
-        # Network
-        elif action == 'wifi_on':
-            return self.wifi_on()
-        elif action == 'wifi_off':
-            return self.wifi_off()
-        elif action == 'wifi_status':
-            return self.wifi_status()
-        elif action == 'bluetooth_on':
-            return self.bluetooth_on()
-        elif action == 'bluetooth_off':
-            return self.bluetooth_off()
-        
-        # Window management
-        elif action == 'minimize_window':
-            return self.minimize_window(kwargs.get('app_name'))
-        elif action == 'maximize_window':
-            return self.maximize_window(kwargs.get('app_name'))
-        elif action == 'close_window':
-            return self.close_window(kwargs.get('app_name'))
-        elif action == 'focus_window':
-            return self.focus_window(kwargs.get('app_name', ''))
-        elif action == 'list_windows':
-            return self.list_windows()
-        
-        # App management
-        elif action == 'open_app':
-            return self.open_app(kwargs.get('app_name', ''))
-        elif action == 'close_app':
-            return self.close_app(kwargs.get('app_name', ''))
-        
-        # Clipboard
-        elif action == 'copy':
-            return self.copy_to_clipboard(kwargs.get('text', ''))
-        elif action in ['paste', 'get_clipboard']:
-            return self.get_clipboard()
-        
-        # Notifications
-        elif action == 'notify':
-            return self.send_notification(
-                kwargs.get('title', 'JARVIS'),
-                kwargs.get('message', ''),
-                kwargs.get('urgency', 'normal')
-            )
-        
-        # File management
-        elif action == 'find_file':
-            return self.find_file(kwargs.get('name', ''), kwargs.get('path', '~'))
-        elif action == 'find_large_files':
-            return self.find_large_files(kwargs.get('min_size', '100M'), kwargs.get('path', '~'))
-        elif action == 'create_file':
-            return self.create_file(kwargs.get('filepath', ''), kwargs.get('content', ''))
-        elif action == 'delete_file':
-            return self.delete_file(kwargs.get('filepath', ''))
-        elif action == 'move_file':
-            return self.move_file(kwargs.get('source', ''), kwargs.get('destination', ''))
-        elif action == 'copy_file':
-            return self.copy_file(kwargs.get('source', ''), kwargs.get('destination', ''))
-        elif action == 'file_info':
-            return self.get_file_info(kwargs.get('filepath', ''))
-        elif action == 'list_dir':
-            return self.list_directory(kwargs.get('path', '.'))
-        elif action == 'open_file_manager':
-            return self.open_file_manager(kwargs.get('path', '~'))
-        
-        else:
+        handler = self._dispatch.get(action)
+        if handler is None:
             return {"success": False, "error": f"Unknown action: {action}"}
+        return handler(kwargs)
 
 
 # Global instance